@@ -0,0 +1,153 @@
+"""
+Cold start benchmark of the app and its engines.
+
+Each target is imported in a fresh interpreter under `-X importtime`, and
+the cumulative import time of the target is kept from the fastest of a
+few runs. Importing a target must not load the modules it defers, the
+first AWKInterpreter must not write parse tables, later ones must reuse
+the parser it built, and with `--baseline` no target may become slower
+than the threshold allows.
+
+Usage: `python importtime.py [--json PATH] [--baseline PATH]`
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Optional
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Modules each target must leave unimported
+DEFERRED = {
+    'streamlit_app': ['pawky.interpreter', 'ply', 'pregexy', 'numpy'],
+    'pawky': ['pawky.interpreter', 'ply'],
+    'pawky.interpreter': [],
+    'pregexy': ['numpy', 'pyarrow'],
+}
+RUNS = 5
+REGRESSION_THRESHOLD = 1.5
+# Differences below this are noise
+MIN_REGRESSION_SECONDS = 0.005
+# Most a later AWKInterpreter may take of the time of the first, which
+# builds the lexer and the parser
+REUSE_RATIO = 0.04
+FIRST_PARSE = '''
+import os, time
+import pawky.interpreter
+directory = os.path.dirname(pawky.interpreter.__file__)
+before = sorted(os.listdir(directory))
+started = time.perf_counter()
+pawky.interpreter.AWKInterpreter('{ print $1; }')
+seconds = time.perf_counter() - started
+started = time.perf_counter()
+pawky.interpreter.AWKInterpreter('{ print $2; }')
+again = time.perf_counter() - started
+print(seconds, again, sorted(os.listdir(directory)) != before)
+'''
+
+
+def python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    # Importing the app opens its log in the working directory
+    return subprocess.run([sys.executable, *args],
+                          cwd=tempfile.gettempdir(),
+                          env=env,
+                          capture_output=True,
+                          text=True,
+                          check=True)
+
+
+def import_time(target: str) -> tuple[float, set[str]]:
+    # Cumulative seconds to import `target`, and every module it imported
+    result = python('-X', 'importtime', '-c', f'import {target}')
+    seconds = 0.0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        if name.strip() == target:
+            # A top-level import is reported last
+            seconds = int(cumulative) / 1e6
+    return seconds, modules
+
+
+def first_parse() -> tuple[float, float, bool]:
+    # Seconds to construct the first and the second interpreter of a
+    # process, and whether that wrote anything next to the package
+    seconds, again, wrote = python('-c', FIRST_PARSE).stdout.split()
+    return float(seconds), float(again), wrote == 'True'
+
+
+def measure(runs: int) -> tuple[dict[str, float], list[str]]:
+    results: dict[str, float] = {}
+    problems = []
+    for target, deferred in DEFERRED.items():
+        import_time(target)  # Compiles bytecode on a fresh checkout
+        timings = []
+        for _ in range(runs):
+            seconds, modules = import_time(target)
+            timings.append(seconds)
+        results[target] = min(timings)
+        problems += [
+            f"importing {target} loads {module}" for module in deferred
+            if module in modules
+        ]
+    parses = [first_parse() for _ in range(runs)]
+    first = min(seconds for seconds, _, _ in parses)
+    again = min(again for _, again, _ in parses)
+    results['first AWKInterpreter'] = first
+    results['second AWKInterpreter'] = again
+    if any(wrote for _, _, wrote in parses):
+        problems.append("the first AWKInterpreter wrote parse tables")
+    if again > first * REUSE_RATIO:
+        problems.append(f"a second AWKInterpreter took {again * 1e3:.1f}ms "
+                        f"after {first * 1e3:.1f}ms for the first")
+    return results, problems
+
+
+def parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure cold start time.")
+    parser.add_argument('--runs', type=int, default=RUNS)
+    parser.add_argument('--json', metavar='PATH', help="write a JSON report")
+    parser.add_argument('--baseline',
+                        metavar='PATH',
+                        help="JSON report to compare timings against")
+    parser.add_argument('--threshold',
+                        type=float,
+                        default=REGRESSION_THRESHOLD,
+                        help="slowdown counted as a regression "
+                        "(default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    results, problems = measure(args.runs)
+    for name, seconds in results.items():
+        print(f"{name:<22} {seconds * 1e3:>9.1f}ms")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for name, seconds in results.items():
+            before = baseline.get(name)
+            if (before is not None and seconds > before * args.threshold
+                    and seconds - before > MIN_REGRESSION_SECONDS):
+                problems.append(f"{name} regressed from {before * 1e3:.1f}ms "
+                                f"to {seconds * 1e3:.1f}ms")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    for problem in problems:
+        print(f"Regression: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+Load test of the Streamlit app with concurrent simulated sessions.
+
+Each session is an `AppTest` of `streamlit_app.py` running a mix of pawky
+scripts and pregexy matches with inputs unique to the session. Every
+result is compared with the same run done directly, so output leaking
+between sessions shows up as a mismatch rather than just a slowdown.
+
+Sessions run on threads of one process, as they do in a Streamlit
+server, so they contend for the pattern cache, the metrics lock and the
+GIL. `AppTest` swaps process-wide runtime state on every run, which would
+break runs on other threads, so `shared_runtime` installs that state once
+for the whole test instead, with one script cache like a server's.
+
+The app log and the metrics log are written to a temporary directory.
+
+Usage: `python loadtest.py --sessions 1,4,16 --iterations 20`
+"""
+
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Iterator, Optional
+from unittest import mock
+
+import streamlit
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import (
+    MemoryCacheStorageManager)
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, app_test, local_script_runner, util
+
+import metrics
+import pregexy
+from pawky import AWKInterpreter
+
+APP = 'streamlit_app.py'
+PAWKY_PAGE = "Pawky - AWK Interpreter in Python"
+PREGEXY_PAGE = "LC0010. Regular Expression Matching"
+DEMOS = ('pawky', 'pregexy')
+SCRIPT_TIMEOUT = 60  # seconds
+# The demo rejects more input than this
+MAX_INPUT_LENGTH = 10000
+
+# Internals of `AppTest` that `shared_runtime` replaces, as found in
+# Streamlit 1.39 to 1.66
+APPTEST_INTERNALS = [
+    (app_test, 'Runtime'),
+    (app_test, 'patch_config_options'),
+    (local_script_runner, 'ScriptCache'),
+]
+
+PAWKY_SCRIPTS = [
+    '''
+BEGIN {
+    FS = ",";
+}
+
+{
+    if ($2 > 50)
+        print $1, $2;
+}
+''',
+    '''
+BEGIN {
+    FS = ",";
+}
+
+{
+    total += $2;
+}
+
+END {
+    print NR, total;
+}
+''',
+]
+PREGEXY_PATTERNS = [
+    "mis*is*ip*.a*a*.*a*.*a*.b*a*a*.*b*c*b*b*.*ac*.*bc*a*.*a*aa*.*b*.c*.*a*",
+    "s.*-[0-9]+(,[a-c]+)?",
+    "a*b*c*.*",
+]
+
+
+def pawky_case(session: int, rng: random.Random,
+               lines: int) -> tuple[str, str, str]:
+    # Records are tagged with the session so leaked output is recognizable
+    script = rng.choice(PAWKY_SCRIPTS)
+    records = [f"s{session}-{i},{rng.randint(0, 100)}" for i in range(lines)]
+    input_data = '\n'.join(records)[:MAX_INPUT_LENGTH]
+    output = io.StringIO()
+    interpreter = AWKInterpreter(script, output=output)
+    interpreter.set_input(input_data)
+    interpreter.run()
+    return script, input_data, output.getvalue()
+
+
+def pregexy_case(session: int, rng: random.Random) -> tuple[str, str, str]:
+    pattern = rng.choice(PREGEXY_PATTERNS)
+    text = f"s{session}-" + "".join(
+        rng.choice("abc,0123") for _ in range(rng.randint(0, 50)))
+    return text, pattern, str(pregexy.is_match(text, pattern))
+
+
+@contextlib.contextmanager
+def shared_runtime() -> Iterator[None]:
+    # What `AppTest` sets up and tears down around each run is set up once,
+    # and its own assignments go to a stand-in nobody reads. The script is
+    # compiled once, under the lock of the cache, since parsing on several
+    # threads at once can fail with `SystemError` before Python 3.12.
+    missing = [
+        f"{module.__name__}.{name}" for module, name in APPTEST_INTERNALS
+        if not hasattr(module, name)
+    ]
+    if missing:
+        raise RuntimeError(
+            f"Streamlit {streamlit.__version__} has no {', '.join(missing)}; "
+            "shared_runtime needs updating for it")
+
+    class PerRunRuntime(Runtime):
+        pass
+
+    script_cache = ScriptCache()
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(util.patch_config_options({'global.appTest':
+                                                       True}))
+        runtime = stack.enter_context(
+            mock.patch.object(Runtime, '_instance',
+                              mock.MagicMock(spec=Runtime)))
+        runtime.media_file_mgr = MediaFileManager(
+            MemoryMediaFileStorage("/mock/media"))
+        runtime.cache_storage_manager = MemoryCacheStorageManager()
+        stack.enter_context(
+            mock.patch.object(app_test, 'Runtime', PerRunRuntime))
+        stack.enter_context(
+            mock.patch.object(app_test, 'patch_config_options',
+                              lambda overrides: contextlib.nullcontext()))
+        stack.enter_context(
+            mock.patch.object(local_script_runner, 'ScriptCache',
+                              lambda: script_cache))
+        if hasattr(app_test, 'ScriptCache'):
+            # Newer releases give the pages manager a script cache of its own
+            stack.enter_context(
+                mock.patch.object(app_test, 'ScriptCache',
+                                  lambda: script_cache))
+        yield
+
+
+def run_once(at: AppTest, demo: str, session: int, rng: random.Random,
+             lines: int) -> dict[str, Any]:
+    if demo == 'pawky':
+        script, input_data, expected = pawky_case(session, rng, lines)
+        at.sidebar.radio[0].set_value(PAWKY_PAGE).run()
+        at.text_area[0].set_value(script)
+        at.text_area[1].set_value(input_data)
+    else:
+        text, pattern, expected = pregexy_case(session, rng)
+        at.sidebar.radio[0].set_value(PREGEXY_PAGE).run()
+        at.text_area[0].set_value(text)
+        at.text_area[1].set_value(pattern)
+
+    started = time.perf_counter()
+    at.button[0].click().run()
+    seconds = time.perf_counter() - started
+
+    if demo == 'pawky':
+        actual = at.session_state['pawky_output'].getvalue().decode()
+    else:
+        actual = at.code[0].value
+    return {
+        'session': session,
+        'demo': demo,
+        'seconds': seconds,
+        'error': bool(at.exception or at.error),
+        'mismatch': actual != expected,
+    }
+
+
+def run_session(session: int, iterations: int, pawky_share: float, lines: int,
+                seed: int,
+                warmed_up: threading.Barrier) -> list[dict[str, Any]]:
+    rng = random.Random(seed * 1000003 + session)
+    try:
+        at = AppTest.from_file(APP, default_timeout=SCRIPT_TIMEOUT).run()
+        for demo in DEMOS:
+            run_once(at, demo, session, rng, lines)
+    except BaseException:
+        warmed_up.abort()  # Or the other sessions would wait forever
+        raise
+    warmed_up.wait()
+    return [
+        run_once(at, 'pawky' if rng.random() < pawky_share else 'pregexy',
+                 session, rng, lines) for _ in range(iterations)
+    ]
+
+
+def rss() -> int:
+    # Resident set size in bytes
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def percentile(values: list[float], q: float) -> float:
+    # Nearest rank
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(q / 100 * len(values)), len(values) - 1)]
+
+
+def run_level(sessions: int, args: argparse.Namespace) -> dict[str, Any]:
+    # Memory growth is measured once every session has warmed up both demos
+    before = []
+    warmed_up = threading.Barrier(sessions,
+                                  action=lambda: before.append(rss()))
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(sessions) as executor:
+        results = list(
+            executor.map(run_session, range(sessions),
+                         [args.iterations] * sessions,
+                         [args.pawky_share] * sessions,
+                         [args.lines] * sessions, [args.seed] * sessions,
+                         [warmed_up] * sessions))
+    wall = time.perf_counter() - started
+    samples = [sample for session in results for sample in session]
+    latencies = [sample['seconds'] for sample in samples]
+    result = {
+        'sessions': sessions,
+        'requests': len(samples),
+        'seconds': wall,
+        'throughput': len(samples) / wall,
+        'errors': sum(sample['error'] for sample in samples),
+        'mismatches': sum(sample['mismatch'] for sample in samples),
+        'rss_growth_bytes': rss() - before[0],
+    }
+    for q in (50, 95, 99):
+        result[f'p{q}_seconds'] = percentile(latencies, q)
+    for demo in DEMOS:
+        result[f'{demo}_p50_seconds'] = percentile([
+            sample['seconds'] for sample in samples if sample['demo'] == demo
+        ], 50)
+    return result
+
+
+def parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Drive concurrent sessions through the demos.")
+    parser.add_argument('--sessions',
+                        default='1,4,16',
+                        help="comma separated concurrency levels "
+                        "(default: %(default)s)")
+    parser.add_argument('--iterations',
+                        type=int,
+                        default=20,
+                        help="runs per session (default: %(default)s)")
+    parser.add_argument('--pawky-share',
+                        type=float,
+                        default=0.5,
+                        help="fraction of runs on the pawky page "
+                        "(default: %(default)s)")
+    parser.add_argument(
+        '--lines',
+        type=int,
+        default=200,
+        help="input lines per pawky run (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='PATH', help="write a JSON report")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    print(f"{'sessions':>8} {'requests':>8} {'req/s':>7} {'p50':>9} "
+          f"{'p95':>9} {'p99':>9} {'errors':>6} {'wrong':>6} {'growth':>9}")
+    results = []
+    with tempfile.TemporaryDirectory() as directory, shared_runtime():
+        # Taken over by the app, whose own configuration is then a no-op
+        logging.basicConfig(filename=os.path.join(directory, 'app.log'),
+                            level=logging.ERROR)
+        metrics.registry = metrics.Metrics(
+            os.path.join(directory, 'metrics.jsonl'))
+        for sessions in map(int, args.sessions.split(',')):
+            result = run_level(sessions, args)
+            results.append(result)
+            print(f"{sessions:>8} {result['requests']:>8} "
+                  f"{result['throughput']:>7.1f} " + " ".join(
+                      f"{metrics.format_seconds(result[f'p{q}_seconds']):>9}"
+                      for q in (50, 95, 99)) + f" {result['errors']:>6} "
+                  f"{result['mismatches']:>6} "
+                  f"{result['rss_growth_bytes'] / 1e6:>7.1f}MB")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'arguments': vars(args),
+                'results': results
+            },
+                      f,
+                      indent=2)
+    failed = any(result['errors'] or result['mismatches']
+                 for result in results)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Per-request timing of the Streamlit demos.
+
+Every run is appended to a JSON lines file and folded into latency
+histograms that live as long as the server process, so percentiles can be
+read without going back over the log. The log goes to `$METRICS_LOG`, by
+default `metrics.jsonl` in the temporary directory.
+"""
+
+import bisect
+import contextlib
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Iterator, Optional
+
+METRICS_LOG = os.environ.get(
+    'METRICS_LOG', os.path.join(tempfile.gettempdir(), 'metrics.jsonl'))
+# Upper bounds of the histogram buckets in seconds: 0.1ms doubling up to
+# about 100s, then everything slower
+BUCKETS = [1e-4 * 2**i for i in range(21)]
+PERCENTILES = (50, 95, 99)
+PHASES = ('parse', 'execute', 'render', 'total')
+
+
+class Histogram:
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        # Upper bound of the bucket holding the q-th percentile, so at most
+        # twice the true value
+        rank = max(math.ceil(q / 100 * self.count), 1)
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank and i < len(BUCKETS):
+                return min(BUCKETS[i], self.max)
+        return self.max
+
+
+class Metrics:
+    """Process-wide aggregate of the events of every session."""
+
+    def __init__(self, path: Optional[str] = METRICS_LOG) -> None:
+        # Sessions run on threads of their own
+        self.lock = threading.Lock()
+        self.histograms: dict[tuple[str, str], Histogram] = {}
+        self.totals: dict[str, dict[str, int]] = {}
+        self.logger = logging.getLogger(f'{__name__}.{id(self)}')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        if path is not None:
+            handler = logging.FileHandler(path, delay=True)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self.logger.addHandler(handler)
+
+    def record(self, event: dict[str, Any]) -> None:
+        self.logger.info(json.dumps(event))
+        demo = event['demo']
+        with self.lock:
+            for phase in PHASES:
+                seconds = event.get(f'{phase}_seconds')
+                if seconds is not None:
+                    self.histograms.setdefault((demo, phase),
+                                               Histogram()).add(seconds)
+            totals = self.totals.setdefault(
+                demo,
+                dict.fromkeys(('requests', 'errors', 'likely_cache_hits',
+                               'records', 'output_bytes'), 0))
+            totals['requests'] += 1
+            totals['errors'] += event['error']
+            totals['likely_cache_hits'] += bool(event.get('likely_cache_hit'))
+            totals['records'] += event.get('records') or 0
+            totals['output_bytes'] += event.get('output_bytes') or 0
+
+    def report(self) -> str:
+        # Plain text table of latency percentiles per demo and phase
+        header = f"{'demo':<10} {'phase':<8} {'count':>7}" + "".join(
+            f"{f'p{q}':>11}" for q in PERCENTILES) + f"{'max':>11}"
+        lines = [header]
+        with self.lock:
+            for (demo, phase), histogram in sorted(self.histograms.items()):
+                lines.append(
+                    f"{demo:<10} {phase:<8} {histogram.count:>7}" +
+                    "".join(f"{format_seconds(histogram.percentile(q)):>11}"
+                            for q in PERCENTILES) +
+                    f"{format_seconds(histogram.max):>11}")
+            lines.append("")
+            for demo, totals in sorted(self.totals.items()):
+                lines.append(f"{demo}: " +
+                             ", ".join(f"{name.replace('_', ' ')} {value:,}"
+                                       for name, value in totals.items()))
+        return '\n'.join(lines)
+
+
+class RequestTimer:
+    """Times the phases of one run and records them when finished."""
+
+    def __init__(self, metrics: Metrics, demo: str) -> None:
+        self.metrics = metrics
+        self.event: dict[str, Any] = {'demo': demo, 'timestamp': time.time()}
+        self.started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.event[f'{name}_seconds'] = time.perf_counter() - started
+
+    def finish(self,
+               records: int = 0,
+               output_bytes: int = 0,
+               likely_cache_hit: Optional[bool] = None,
+               error: bool = False) -> dict[str, Any]:
+        event = self.event
+        event['total_seconds'] = time.perf_counter() - self.started
+        event['records'] = records
+        execute = event.get('execute_seconds')
+        event['records_per_second'] = (records / execute if execute else None)
+        event['output_bytes'] = output_bytes
+        event['likely_cache_hit'] = likely_cache_hit
+        event['error'] = error
+        self.metrics.record(event)
+        return event
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.2f}s"
+
+
+def footer(event: dict[str, Any]) -> str:
+    # One-line summary of a recorded event for the UI
+    parts = [
+        f"{phase} {format_seconds(event[f'{phase}_seconds'])}"
+        for phase in PHASES if event.get(f'{phase}_seconds') is not None
+    ]
+    if event['records_per_second'] is not None:
+        parts.append(f"{event['records']:,} records "
+                     f"({event['records_per_second']:,.0f}/s)")
+    parts.append(f"{event['output_bytes']:,} output bytes")
+    if event['likely_cache_hit'] is not None:
+        parts.append("likely cache hit"
+                     if event['likely_cache_hit'] else "likely cache miss")
+    return " · ".join(parts)
+
+
+# Module state outlives the reruns of the app script
+registry = Metrics()
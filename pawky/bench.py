@@ -0,0 +1,61 @@
+"""
+Throughput of the pawky command line against the system `awk`.
+
+Both run the same programs over the same generated CSV file, and their
+outputs are compared. Usage: `python bench.py [lines]`
+"""
+
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_LINES = 200000
+PROGRAMS = [
+    ("sum a column", '{ total += $2; } END { print NR, total; }'),
+    ("filter", '{ if ($2 > 500) print $1, $3; }'),
+    ("print all", '{ print $0; }'),
+]
+
+
+def generate(path: str, lines: int) -> None:
+    rng = random.Random(0)
+    with open(path, 'w') as f:
+        for i in range(lines):
+            f.write(f"key{i},{rng.randint(0, 1000)},"
+                    f"{rng.choice(['red', 'green', 'blue'])}\n")
+
+
+def run(command: list[str]) -> tuple[float, bytes]:
+    started = time.perf_counter()
+    result = subprocess.run(command, check=True, stdout=subprocess.PIPE)
+    return time.perf_counter() - started, result.stdout
+
+
+def main() -> None:
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    awk = shutil.which('awk')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'input.csv')
+        generate(path, lines)
+        megabytes = os.path.getsize(path) / 1e6
+        print(f"{lines} lines, {megabytes:.1f} MB")
+        print(f"{'program':<14} {'pawky':>12} {'awk':>12} {'ratio':>7}")
+        for name, program in PROGRAMS:
+            pawky_seconds, pawky_output = run(
+                [sys.executable, '-m', 'pawky', '-F', ',', program, path])
+            if awk is None:
+                print(f"{name:<14} {megabytes / pawky_seconds:>7.1f} MB/s")
+                continue
+            awk_seconds, awk_output = run([awk, '-F', ',', program, path])
+            assert pawky_output == awk_output, name
+            print(f"{name:<14} {megabytes / pawky_seconds:>7.1f} MB/s "
+                  f"{megabytes / awk_seconds:>7.1f} MB/s "
+                  f"{pawky_seconds / awk_seconds:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
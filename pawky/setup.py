@@ -12,6 +12,12 @@ setup(
     install_requires=[
         'ply',
     ],
+    entry_points={
+        'console_scripts': ['pawky=pawky.cli:main'],
+    },
+    extras_require={
+        'arrow': ['pyarrow'],
+    },
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: MIT License',
@@ -1,3 +1,10 @@
-from .interpreter import AWKInterpreter
-
 __all__ = ['AWKInterpreter']
+
+
+def __getattr__(name: str):
+    # Importing a submodule, e.g. `pawky.reader`, leaves PLY and the
+    # compiler unloaded until the interpreter is needed
+    if name == 'AWKInterpreter':
+        from .interpreter import AWKInterpreter
+        return AWKInterpreter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
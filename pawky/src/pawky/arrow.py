@@ -0,0 +1,162 @@
+from collections import deque
+from typing import Any, Iterator, Optional
+
+import pyarrow as pa
+
+from .interpreter import AWKInterpreter
+
+DEFAULT_BATCH_SIZE = 65536
+
+
+class RecordBatchSink:
+
+    def __init__(self,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 schema: Optional[pa.Schema] = None) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.batch_size = batch_size
+        self.schema = schema
+        self.columns: list[list[Any]] = []
+        self.length = 0
+        self.ready: deque[pa.RecordBatch] = deque()
+        # Without a schema, the arrays of every batch typed on their own
+        self.held: list[list[pa.Array]] = []
+
+    def append(self, values: list[Any]) -> None:
+        # `print` with fewer expressions than earlier ones leaves nulls
+        for _ in range(len(self.columns), len(values)):
+            self.columns.append([None] * self.length)
+        for i, column in enumerate(self.columns):
+            column.append(values[i] if i < len(values) else None)
+        self.length += 1
+        if self.length >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.length:
+            return
+        if self.schema is not None:
+            if len(self.columns) > len(self.schema):
+                raise ValueError(
+                    f"print produced {len(self.columns)} values but the schema has {len(self.schema)} fields"
+                )
+            for _ in range(len(self.columns), len(self.schema)):
+                self.columns.append([None] * self.length)
+            arrays = [
+                to_array(column, field.type, field.name)
+                for column, field in zip(self.columns, self.schema)
+            ]
+            self.ready.append(
+                pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        else:
+            self.held.append([to_array(column) for column in self.columns])
+        self.columns = []
+        self.length = 0
+
+    def close(self) -> None:
+        # Without a schema, a later batch may widen a column, e.g. to float
+        # after ints, so batches are only handed out once every one is in,
+        # all with the promoted types and thus able to join one table
+        self.flush()
+        if not self.held:
+            return
+        types: list[pa.DataType] = []
+        for arrays in self.held:
+            for i, array in enumerate(arrays):
+                if i == len(types):
+                    types.append(array.type)
+                else:
+                    types[i] = promote(types[i], array.type)
+        schema = pa.schema(
+            pa.field(f"field{i}", data_type)
+            for i, data_type in enumerate(types, start=1))
+        for arrays in self.held:
+            length = len(arrays[0])
+            arrays = arrays + [
+                pa.nulls(length, data_type)
+                for data_type in types[len(arrays):]
+            ]
+            self.ready.append(
+                pa.RecordBatch.from_arrays([
+                    array if array.type == field.type else to_array(
+                        array.to_pylist(), field.type, field.name)
+                    for array, field in zip(arrays, schema)
+                ],
+                                           schema=schema))
+        self.held = []
+
+    def drain(self) -> Iterator[pa.RecordBatch]:
+        while self.ready:
+            yield self.ready.popleft()
+
+
+def infer_type(values: list[Any]) -> pa.DataType:
+    kinds = {type(value) for value in values if value is not None}
+    if not kinds:
+        return pa.null()  # Decided by the other batches
+    elif kinds <= {bool, int}:
+        return pa.int64()
+    elif kinds <= {bool, int, float}:
+        return pa.float64()
+    else:
+        return pa.string()
+
+
+def promote(left: pa.DataType, right: pa.DataType) -> pa.DataType:
+    # Narrowest type holding both: int64 -> float64 -> string
+    if left == right or pa.types.is_null(right):
+        return left
+    elif pa.types.is_null(left):
+        return right
+    elif {left, right} == {pa.int64(), pa.float64()}:
+        return pa.float64()
+    return pa.string()
+
+
+def to_array(values: list[Any],
+             data_type: Optional[pa.DataType] = None,
+             name: str = "") -> pa.Array:
+    if data_type is None:
+        data_type = infer_type(values)
+    if pa.types.is_string(data_type) or pa.types.is_large_string(data_type):
+        # Same text `print` would have written
+        values = [None if value is None else str(value) for value in values]
+    elif pa.types.is_integer(data_type) or pa.types.is_floating(data_type):
+        convert = int if pa.types.is_integer(data_type) else float
+        converted = []
+        for value in values:
+            if value is None:
+                converted.append(None)
+                continue
+            try:
+                number = convert(value)
+            except (ValueError, OverflowError):
+                number = None  # Text, or an infinity for an int column
+            # Never silently drop text or a fractional part
+            if number is None or isinstance(value, float) and number != value:
+                raise ValueError(
+                    f"{value!r} does not fit column {name!r} of type "
+                    f"{data_type}")
+            converted.append(number)
+        values = converted
+    return pa.array(values, type=data_type)
+
+
+def iter_record_batches(
+        interpreter: AWKInterpreter,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        schema: Optional[pa.Schema] = None) -> Iterator[pa.RecordBatch]:
+    # With a schema, batches are handed out as soon as they fill up, while
+    # the input is still being processed. Without one, column types are
+    # promoted over the whole output, so batches come at the end.
+    sink = RecordBatchSink(batch_size, schema)
+    interpreter.sink = sink
+    interpreter.run_begin()
+    yield from sink.drain()
+    for record in interpreter.records():
+        interpreter.process_record(record)
+        yield from sink.drain()
+    interpreter.run_end()
+    sink.close()
+    yield from sink.drain()
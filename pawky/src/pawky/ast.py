@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Callable, Optional
 
 
 class ASTNode:
@@ -6,7 +6,8 @@ class ASTNode:
 
 
 class Expression(ASTNode):
-    pass
+    # Set by the type inference pass
+    static_type = 'dynamic'
 
 
 class Statement(ASTNode):
@@ -41,6 +42,8 @@ class Assignment(Statement):
         self.variable = variable
         self.operator = operator
         self.expression = expression
+        # Compound assignments get a specialized operator from type inference
+        self.apply: Optional[Callable[[Any, Any], Any]] = None
 
 
 class IfStatement(Statement):
@@ -73,6 +76,8 @@ class IncrementOperation(Statement):
         self.variable = variable
         self.operator = operator
         self.position = position
+        # Whether the variable is statically known to hold a number
+        self.numeric = False
 
 
 class BinaryOperation(Expression):
@@ -82,6 +87,7 @@ class BinaryOperation(Expression):
         self.left = left
         self.operator = operator
         self.right = right
+        self.apply: Optional[Callable[[Any, Any], Any]] = None
 
 
 class UnaryOperation(Expression):
@@ -89,6 +95,7 @@ class UnaryOperation(Expression):
     def __init__(self, operator: str, operand: Expression) -> None:
         self.operator = operator
         self.operand = operand
+        self.apply: Optional[Callable[[Any], Any]] = None
 
 
 class Literal(Expression):
@@ -107,3 +114,5 @@ class FieldVariable(Expression):
 
     def __init__(self, index: Literal | Variable) -> None:
         self.index = index
+        # Fields only used as numbers skip the strnum check
+        self.numeric = False
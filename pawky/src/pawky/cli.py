@@ -0,0 +1,137 @@
+"""
+Command line front end: `pawky 'program' [file ...]`
+
+Input is read as bytes in large blocks and decoded ahead of use on a
+background thread, and all output goes through one buffered writer that
+is flushed once at exit.
+"""
+
+import argparse
+import io
+import os
+import re
+import sys
+from typing import Optional
+
+from .inference import BUILTIN_TYPES, NUMBER, STRING, strnum, to_number
+from .interpreter import AWKInterpreter
+from .reader import STDIN
+
+OUTPUT_BUFFER_SIZE = 1 << 16
+ESCAPE = re.compile(r'\\([0-7]{1,3}|.)', re.DOTALL)
+ESCAPES = {
+    '"': '"',
+    '/': '/',
+    '\\': '\\',
+    'a': '\a',
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+    'v': '\v',
+}
+
+
+def unescape(text: str) -> str:
+    # Values from the command line take the escapes of AWK string literals,
+    # and an unknown escape stands for the char itself
+    def replace(match: re.Match) -> str:
+        escape = match.group(1)
+        if escape[0] in '01234567':
+            return chr(int(escape, 8))
+        return ESCAPES.get(escape, escape)
+
+    return ESCAPE.sub(replace, text)
+
+
+def parse_field_separator(text: str) -> str:
+    # As in POSIX awk, a lone 't' is a tab
+    return '\t' if text == 't' else unescape(text)
+
+
+def parse_assignment(text: str) -> tuple[str, str | int | float]:
+    name, separator, value = text.partition('=')
+    if not separator or not name.isidentifier():
+        raise argparse.ArgumentTypeError(f"expected name=value, got {text!r}")
+    value = unescape(value)
+    # Builtins keep their types, e.g. FS is always a string, while other
+    # values that look numeric are numbers like fields
+    if BUILTIN_TYPES.get(name) == STRING:
+        return name, value
+    elif BUILTIN_TYPES.get(name) == NUMBER:
+        return name, to_number(value)
+    return name, strnum(value)
+
+
+def parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='pawky', description='Run an AWK program over files or stdin.')
+    parser.add_argument('-f',
+                        '--file',
+                        dest='script_file',
+                        metavar='SCRIPT',
+                        help='read the program from SCRIPT')
+    parser.add_argument('-F',
+                        '--field-separator',
+                        type=parse_field_separator,
+                        metavar='FS',
+                        help='field separator')
+    parser.add_argument('-v',
+                        '--assign',
+                        action='append',
+                        default=[],
+                        type=parse_assignment,
+                        metavar='NAME=VALUE',
+                        help='set a variable before BEGIN runs')
+    parser.add_argument(
+        '--encoding',
+        default='utf-8',
+        help='input and output encoding (default: %(default)s)')
+    parser.add_argument('args',
+                        nargs='*',
+                        metavar='ARG',
+                        help="the program unless -f is given, then files "
+                        "('-' for stdin)")
+    args = parser.parse_intermixed_args(argv)
+    if args.script_file is None:
+        if not args.args:
+            parser.error('no program given')
+        args.program = args.args.pop(0)
+    args.files = args.args or [STDIN]
+    return args
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    output = io.TextIOWrapper(io.BufferedWriter(
+        io.FileIO(sys.stdout.fileno(), 'w', closefd=False),
+        OUTPUT_BUFFER_SIZE),
+                              encoding=args.encoding,
+                              newline='')
+    try:
+        if args.script_file is not None:
+            with open(args.script_file, encoding=args.encoding) as f:
+                program = f.read()
+        else:
+            program = args.program
+        variables = dict(args.assign)
+        if args.field_separator is not None:
+            variables['FS'] = args.field_separator
+        interpreter = AWKInterpreter(program,
+                                     output=output,
+                                     variables=variables)
+        interpreter.set_input_files(args.files, args.encoding)
+        interpreter.run()
+        output.flush()
+    except BrokenPipeError:
+        # The reader went away, e.g. `| head`; drop what is left unwritten
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    except Exception as e:
+        # Syntax, I/O and runtime errors alike, after the output so far
+        output.flush()
+        print(f"pawky: {e}", file=sys.stderr)
+        return 2
+    return 0
@@ -0,0 +1,273 @@
+from typing import Any, Callable
+
+from .ast import *
+from .exceptions import *
+from .inference import *
+
+Action = Callable[[], None]
+Evaluator = Callable[[], Any]
+
+
+def no_op() -> None:
+    pass
+
+
+def field_index(index: Any) -> int:
+    if isinstance(index, str):
+        if index.isdigit():
+            return int(index)
+        else:
+            return -1
+    return index
+
+
+class AWKCompiler:
+    # Turns the type-annotated AST into nested closures over the
+    # interpreter, so execution never dispatches on node types and every
+    # operation is the one specialized for its operand types
+
+    def __init__(self, interpreter: Any) -> None:
+        self.interpreter = interpreter
+
+    def storage(self, name: str) -> str:
+        # Name of the interpreter attribute holding the variable
+        return 'builtins' if name in BUILTIN_TYPES else 'variables'
+
+    def compile_statements(self, statements: list[Statement]) -> Action:
+        actions = [self.compile_statement(stmt) for stmt in statements]
+        if not actions:
+            return no_op
+        elif len(actions) == 1:
+            return actions[0]
+
+        def run() -> None:
+            for action in actions:
+                action()
+
+        return run
+
+    def compile_statement(self, stmt: Statement) -> Action:
+        if isinstance(stmt, PrintStatement):
+            return self.compile_print(stmt)
+        elif isinstance(stmt, Assignment):
+            return self.compile_assignment(stmt)
+        elif isinstance(stmt, IfStatement):
+            return self.compile_if(stmt)
+        elif isinstance(stmt, ForLoop):
+            return self.compile_for(stmt)
+        elif isinstance(stmt, BreakStatement):
+            return self.compile_break(stmt)
+        elif isinstance(stmt, IncrementOperation):
+            return self.compile_increment(stmt)
+        elif isinstance(stmt, Block):
+            return self.compile_statements(stmt.statements)
+        else:
+            raise NotImplementedError(f"Unknown statement type: {type(stmt)}")
+
+    def compile_print(self, stmt: PrintStatement) -> Action:
+        interpreter = self.interpreter
+        values = [self.compile_expression(expr) for expr in stmt.expressions]
+        texts = [self.compile_text(expr) for expr in stmt.expressions]
+
+        def run() -> None:
+            # A sink gets the values themselves, with numbers converted
+            if interpreter.sink is not None:
+                interpreter.sink.append([value() for value in values])
+                return
+            builtins = interpreter.builtins
+            print(builtins['OFS'].join([text() for text in texts]),
+                  end=builtins['ORS'],
+                  file=interpreter.output)
+
+        return run
+
+    def compile_assignment(self, stmt: Assignment) -> Action:
+        interpreter = self.interpreter
+        name = stmt.variable
+        storage = self.storage(name)
+        value = self.compile_expression(stmt.expression)
+
+        if stmt.operator == '=':
+
+            def assign() -> None:
+                getattr(interpreter, storage)[name] = value()
+
+            return assign
+        elif stmt.apply is not None:
+            apply = stmt.apply
+
+            def update() -> None:
+                variables = getattr(interpreter, storage)
+                variables[name] = apply(variables.get(name, 0), value())
+
+            return update
+        else:
+            raise SyntaxError(f"Unknown assignment operator: {stmt.operator}")
+
+    def compile_if(self, stmt: IfStatement) -> Action:
+        condition = self.compile_expression(stmt.condition)
+        then_branch = self.compile_statements(stmt.then_branch)
+        else_branch = self.compile_statements(stmt.else_branch or [])
+
+        def run() -> None:
+            if condition():
+                then_branch()
+            else:
+                else_branch()
+
+        return run
+
+    def compile_for(self, stmt: ForLoop) -> Action:
+        init = self.compile_statement(stmt.init) if stmt.init else no_op
+        condition = self.compile_expression(stmt.condition)
+        increment = (self.compile_statement(stmt.increment)
+                     if stmt.increment else no_op)
+        body = self.compile_statements(stmt.body)
+
+        def run() -> None:
+            init()
+            while condition():
+                try:
+                    body()
+                except BreakException:
+                    break
+                increment()
+
+        return run
+
+    def compile_break(self, stmt: BreakStatement) -> Action:
+
+        def run() -> None:
+            raise BreakException()
+
+        return run
+
+    def compile_increment(self, stmt: IncrementOperation) -> Action:
+        interpreter = self.interpreter
+        name = stmt.variable
+        storage = self.storage(name)
+        delta = 1 if stmt.operator == '++' else -1  # `++` or `--`
+
+        if stmt.numeric:
+
+            def increment() -> None:
+                variables = getattr(interpreter, storage)
+                variables[name] = variables.get(name, 0) + delta
+        else:
+
+            def increment() -> None:
+                variables = getattr(interpreter, storage)
+                variables[name] = to_number(variables.get(name, 0)) + delta
+
+        return increment
+
+    def compile_expression(self, expr: Expression) -> Evaluator:
+        if isinstance(expr, Literal):
+            return self.compile_literal(expr)
+        elif isinstance(expr, Variable):
+            return self.compile_variable(expr)
+        elif isinstance(expr, FieldVariable):
+            if expr.numeric:
+                text = self.compile_field_text(expr)
+                return lambda: to_number(text())
+            return self.compile_field(expr)
+        elif isinstance(expr, BinaryOperation):
+            return self.compile_binary_operation(expr)
+        elif isinstance(expr, UnaryOperation):
+            return self.compile_unary_operation(expr)
+        else:
+            raise NotImplementedError(f"Unknown expression type: {type(expr)}")
+
+    def compile_text(self, expr: Expression) -> Callable[[], str]:
+        value = self.compile_expression(expr)
+        if expr.static_type == STRING:
+            return value
+        return lambda: str(value())
+
+    def compile_literal(self, expr: Literal) -> Evaluator:
+        value = expr.value
+        return lambda: value
+
+    def compile_variable(self, expr: Variable) -> Evaluator:
+        interpreter = self.interpreter
+        name = expr.name
+        if name in BUILTIN_TYPES:
+            return lambda: interpreter.builtins[name]
+        # Undefined variables default to 0
+        return lambda: interpreter.variables.get(name, 0)
+
+    def compile_field_index(self, expr: FieldVariable) -> Callable[[], int]:
+        index = self.compile_expression(expr.index)
+        if expr.index.static_type == NUMBER:
+            return index
+        return lambda: field_index(index())
+
+    def compile_field_text(self, expr: FieldVariable) -> Callable[[], str]:
+        interpreter = self.interpreter
+        index = self.compile_field_index(expr)
+
+        def text() -> str:
+            i = index()
+            if i == 0:
+                return interpreter.line
+            fields = interpreter.fields
+            if 1 <= i <= len(fields):
+                return fields[i - 1]
+            return ""
+
+        return text
+
+    def compile_field(self, expr: FieldVariable) -> Evaluator:
+        interpreter = self.interpreter
+        index = self.compile_field_index(expr)
+
+        def value() -> int | float | str:
+            i = index()
+            if i == 0:
+                return interpreter.line
+            fields = interpreter.fields
+            if 1 <= i <= len(fields):
+                return strnum(fields[i - 1])
+            return ""
+
+        return value
+
+    def compile_binary_operation(self, expr: BinaryOperation) -> Evaluator:
+        left = self.compile_expression(expr.left)
+        right = self.compile_expression(expr.right)
+        # `&&` and `||` short-circuit and evaluate to one of their operands
+        if expr.operator == '&&':
+            return lambda: left() and right()
+        elif expr.operator == '||':
+            return lambda: left() or right()
+        elif expr.apply is None:
+            raise SyntaxError(f"Unknown binary operator: {expr.operator}")
+        apply = expr.apply
+        operator = expr.operator
+
+        def evaluate() -> Any:
+            left_value = left()
+            right_value = right()
+            try:
+                return apply(left_value, right_value)
+            except Exception as e:
+                raise Exception(f"Error applying operator '{operator}': {e}")
+
+        return evaluate
+
+    def compile_unary_operation(self, expr: UnaryOperation) -> Evaluator:
+        operand = self.compile_expression(expr.operand)
+        if expr.apply is None:
+            raise SyntaxError(f"Unknown unary operator: {expr.operator}")
+        apply = expr.apply
+        operator = expr.operator
+
+        def evaluate() -> Any:
+            value = operand()
+            try:
+                return apply(value)
+            except Exception as e:
+                raise Exception(
+                    f"Error applying unary operator '{operator}': {e}")
+
+        return evaluate
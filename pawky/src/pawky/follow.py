@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Optional
+
+from .interpreter import AWKInterpreter
+
+CHUNK_SIZE = 1 << 16
+# Leading bytes hashed to tell a rewritten file from one that only grew
+FINGERPRINT_SIZE = 1024
+
+
+class LogFollower:
+
+    def __init__(self,
+                 interpreter: AWKInterpreter,
+                 path: str,
+                 state_path: str,
+                 chunk_size: int = CHUNK_SIZE) -> None:
+        self.interpreter = interpreter
+        self.path = path
+        self.state_path = state_path
+        self.chunk_size = chunk_size
+        self.offset = 0
+        self.file_id: Optional[tuple[int, int]] = None
+        self.fingerprint = fingerprint(b"")
+        self.fingerprint_size = 0
+
+    def restore(self) -> bool:
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return False
+        # The offset and fingerprint only mean something for the same log
+        if os.path.abspath(state['path']) != os.path.abspath(self.path):
+            raise ValueError(f"{self.state_path} holds the state of "
+                             f"{state['path']}, not {self.path}")
+        self.offset = state['offset']
+        self.file_id = tuple(state['file_id']) if state['file_id'] else None
+        self.fingerprint = state['fingerprint']
+        self.fingerprint_size = state['fingerprint_size']
+        self.interpreter.variables = state['variables']
+        # Snapshots from before a builtin was added keep its default
+        self.interpreter.builtins.update(state['builtins'])
+        return True
+
+    def save(self) -> None:
+        state: dict[str, Any] = {
+            'path': os.path.abspath(self.path),
+            'offset': self.offset,
+            'file_id': self.file_id,
+            'fingerprint': self.fingerprint,
+            'fingerprint_size': self.fingerprint_size,
+            'variables': self.interpreter.variables,
+            'builtins': self.interpreter.builtins,
+        }
+        # Replace atomically so a crash never leaves a torn snapshot
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_path)
+
+    def poll(self) -> int:
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return 0  # Between rotation and the new file being created
+        with f:
+            stat = os.fstat(f.fileno())
+            file_id = (stat.st_dev, stat.st_ino)
+            if self.is_replaced(f, file_id, stat.st_size):
+                # Rotated or truncated; the accumulators carry over
+                self.offset = 0
+            self.file_id = file_id
+            f.seek(self.offset)
+            count = self.consume(f)
+            size = min(self.offset, FINGERPRINT_SIZE)
+            if size != self.fingerprint_size:
+                f.seek(0)
+                self.fingerprint = fingerprint(f.read(size))
+                self.fingerprint_size = size
+        return count
+
+    def is_replaced(self, f, file_id: tuple[int, int], size: int) -> bool:
+        if self.file_id is None:
+            return False
+        if file_id != self.file_id or size < self.offset:
+            return True
+        # Compare only as many leading bytes as were hashed last time
+        f.seek(0)
+        head = f.read(self.fingerprint_size)
+        return fingerprint(head) != self.fingerprint
+
+    def consume(self, f) -> int:
+        # Only records terminated by RS are processed; a trailing partial
+        # record is left for the next poll
+        encoded_separator = self.interpreter.builtins['RS'].encode()
+        count = 0
+        pending = bytearray()
+        while chunk := f.read(self.chunk_size):
+            # Only the new bytes, and a separator straddling them, are
+            # searched, so a long record costs linear time
+            start = max(len(pending) - len(encoded_separator) + 1, 0)
+            pending += chunk
+            end = pending.rfind(encoded_separator, start)
+            if end == -1:
+                continue
+            end += len(encoded_separator)
+            # The offset moves past each record as it is processed, so a
+            # snapshot taken after an interrupt never counts one twice
+            for record in pending[:end].split(encoded_separator)[:-1]:
+                if self.interpreter.process_record(
+                        record.decode('utf-8', errors='replace')):
+                    count += 1
+                self.offset += len(record) + len(encoded_separator)
+            del pending[:end]
+        return count
+
+    def run(self) -> None:
+        # Catch up on new records and report; END blocks run after the
+        # snapshot so they never leak into the persisted accumulators
+        if not self.restore():
+            self.interpreter.run_begin()
+        self.poll()
+        self.save()
+        self.interpreter.run_end()
+
+    def follow(self,
+               interval: float = 1.0,
+               max_polls: Optional[int] = None) -> None:
+        if not self.restore():
+            self.interpreter.run_begin()
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                if self.poll():
+                    self.save()
+                polls += 1
+                if max_polls is None or polls < max_polls:
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        self.save()
+        self.interpreter.run_end()
+
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
@@ -0,0 +1,226 @@
+import operator
+import re
+from typing import Any, Callable, Iterable
+
+from .ast import *
+
+NUMBER = 'number'
+STRING = 'string'
+DYNAMIC = 'dynamic'  # Only known at runtime e.g., fields
+
+BUILTIN_TYPES = {
+    'FS': STRING,
+    'OFS': STRING,
+    'RS': STRING,
+    'ORS': STRING,
+    'NF': NUMBER,
+    'NR': NUMBER,
+    'FNR': NUMBER,
+    'FILENAME': STRING,
+}
+
+ARITHMETIC_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '%': operator.mod,
+}
+
+COMPARISON_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+# Leading numeric prefix AWK uses when a string is used as a number
+NUMBER_PREFIX = re.compile(r'\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?')
+
+
+def to_number(value: Any) -> int | float:
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    match = NUMBER_PREFIX.match(value)
+    if match is None:
+        return 0
+    text = match.group()
+    if '.' in text or 'e' in text or 'E' in text:
+        return float(text)
+    return int(text)
+
+
+def to_string(value: Any) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+def strnum(field: str) -> int | float | str:
+    # Attempt to convert the field to int or float
+    try:
+        if '.' in field:
+            return float(field)
+        else:
+            return int(field)
+    except ValueError:
+        return field  # Return as string if not a number
+
+
+def join(left: str, right: str) -> str:
+    return left if left == right else DYNAMIC
+
+
+def arithmetic(operator: str, left_type: str,
+               right_type: str) -> Callable[[Any, Any], Any]:
+    apply = ARITHMETIC_OPERATORS[operator]
+    if left_type == NUMBER and right_type == NUMBER:
+        return apply
+    elif left_type == NUMBER:
+        return lambda left, right: apply(left, to_number(right))
+    elif right_type == NUMBER:
+        return lambda left, right: apply(to_number(left), right)
+    else:
+        return lambda left, right: apply(to_number(left), to_number(right))
+
+
+def comparison(operator: str, left_type: str,
+               right_type: str) -> Callable[[Any, Any], bool]:
+    apply = COMPARISON_OPERATORS[operator]
+    if left_type == right_type != DYNAMIC:
+        return apply
+    elif STRING in (left_type, right_type):
+        return lambda left, right: apply(to_string(left), to_string(right))
+
+    # Fields are already numbers when they look numeric, so numbers are
+    # compared numerically and anything involving a string as strings
+    def compare(left: Any, right: Any) -> bool:
+        if isinstance(left, str) or isinstance(right, str):
+            return apply(to_string(left), to_string(right))
+        return apply(left, right)
+
+    return compare
+
+
+def negate(operand_type: str) -> Callable[[Any], Any]:
+    if operand_type == NUMBER:
+        return operator.neg
+    return lambda operand: -to_number(operand)
+
+
+class TypeInference:
+
+    def __init__(self, program: Program, preset: Iterable[str] = ()) -> None:
+        self.program = program
+        self.variable_types: dict[str, str] = dict(BUILTIN_TYPES)
+        # Variables given a value from outside the script may hold anything,
+        # while builtins keep their types
+        for name in preset:
+            if name not in BUILTIN_TYPES:
+                self.variable_types[name] = DYNAMIC
+
+    def run(self) -> dict[str, str]:
+        # Variable types only ever widen, so this reaches a fixed point
+        # within a few passes
+        while True:
+            before = dict(self.variable_types)
+            for block in self.program.blocks:
+                self.visit_block(block)
+            if self.variable_types == before:
+                return self.variable_types
+
+    def variable_type(self, name: str) -> str:
+        # Undefined variables default to 0
+        return self.variable_types.get(name, NUMBER)
+
+    def assign(self, name: str, value_type: str) -> None:
+        self.variable_types[name] = join(self.variable_type(name), value_type)
+
+    def visit_block(self, block: Block) -> None:
+        if block.pattern:
+            self.visit_expression(block.pattern)
+        self.visit_statements(block.statements)
+
+    def visit_statements(self, statements: list[Statement]) -> None:
+        for stmt in statements:
+            self.visit_statement(stmt)
+
+    def visit_statement(self, stmt: Statement) -> None:
+        if isinstance(stmt, PrintStatement):
+            for expr in stmt.expressions:
+                self.visit_expression(expr)
+        elif isinstance(stmt, Assignment):
+            value_type = self.visit_expression(stmt.expression)
+            if stmt.operator == '=':
+                self.assign(stmt.variable, value_type)
+            else:
+                value_type = numeric_operand(stmt.expression, value_type)
+                stmt.apply = arithmetic(stmt.operator[0],
+                                        self.variable_type(stmt.variable),
+                                        value_type)
+                self.assign(stmt.variable, NUMBER)
+        elif isinstance(stmt, IfStatement):
+            self.visit_expression(stmt.condition)
+            self.visit_statements(stmt.then_branch)
+            if stmt.else_branch:
+                self.visit_statements(stmt.else_branch)
+        elif isinstance(stmt, ForLoop):
+            if stmt.init:
+                self.visit_statement(stmt.init)
+            self.visit_expression(stmt.condition)
+            if stmt.increment:
+                self.visit_statement(stmt.increment)
+            self.visit_statements(stmt.body)
+        elif isinstance(stmt, IncrementOperation):
+            stmt.numeric = self.variable_type(stmt.variable) == NUMBER
+            self.assign(stmt.variable, NUMBER)
+        elif isinstance(stmt, Block):
+            self.visit_statements(stmt.statements)
+
+    def visit_expression(self, expr: Expression) -> str:
+        if isinstance(expr, Literal):
+            expr.static_type = STRING if isinstance(expr.value,
+                                                    str) else NUMBER
+        elif isinstance(expr, Variable):
+            expr.static_type = self.variable_type(expr.name)
+        elif isinstance(expr, FieldVariable):
+            self.visit_expression(expr.index)
+            expr.static_type = DYNAMIC
+        elif isinstance(expr, BinaryOperation):
+            left_type = self.visit_expression(expr.left)
+            right_type = self.visit_expression(expr.right)
+            if expr.operator in ARITHMETIC_OPERATORS:
+                left_type = numeric_operand(expr.left, left_type)
+                right_type = numeric_operand(expr.right, right_type)
+                expr.apply = arithmetic(expr.operator, left_type, right_type)
+                expr.static_type = NUMBER
+            elif expr.operator in COMPARISON_OPERATORS:
+                expr.apply = comparison(expr.operator, left_type, right_type)
+                expr.static_type = NUMBER
+            else:
+                # `&&` and `||` evaluate to one of their operands
+                expr.static_type = join(left_type, right_type)
+        elif isinstance(expr, UnaryOperation):
+            operand_type = self.visit_expression(expr.operand)
+            if expr.operator == '-':
+                operand_type = numeric_operand(expr.operand, operand_type)
+                expr.apply = negate(operand_type)
+                expr.static_type = NUMBER
+            else:
+                expr.apply = operator.not_
+                expr.static_type = NUMBER
+        return expr.static_type
+
+
+def numeric_operand(expr: Expression, expr_type: str) -> str:
+    # A field used as a number is converted straight away instead of being
+    # checked for whether it looks numeric
+    if isinstance(expr, FieldVariable):
+        expr.numeric = True
+        expr.static_type = NUMBER
+        return NUMBER
+    return expr_type
@@ -1,9 +1,18 @@
+import os
+import threading
+from typing import Optional
+
 import ply.yacc as yacc
 
 from .ast import *
 from .exceptions import *
 from .lexer import *
 
+# Parse tables shipped with the package, so they are never rebuilt or
+# written at runtime. Run `python -m pawky.parser` after changing the
+# grammar; stale tables are detected and rebuilt in memory until then.
+TABLE_MODULE = 'pawky.parsetab'
+
 
 class AWKParser:
     tokens = AWKLexer.tokens
@@ -19,13 +28,30 @@ class AWKParser:
         ('right', 'UMINUS'),
     )
 
+    # Building the lexer and the parser checks every rule by reflection,
+    # so both are built by the first instance and shared by all. A PLY
+    # parser keeps the state of a parse on itself, hence the lock.
+    lexer: Optional[AWKLexer] = None
+    parser: Optional[yacc.LRParser] = None
+    lock = threading.Lock()
+
     def __init__(self) -> None:
-        self.lexer = AWKLexer()
-        self.lexer.build()
-        self.parser = yacc.yacc(module=self, start='program')
+        with AWKParser.lock:
+            if AWKParser.parser is None:
+                lexer = AWKLexer()
+                lexer.build()
+                AWKParser.lexer = lexer
+                AWKParser.parser = yacc.yacc(module=self,
+                                             start='program',
+                                             tabmodule=TABLE_MODULE,
+                                             write_tables=False,
+                                             debug=False)
 
     def parse(self, data: str) -> Program:
-        return self.parser.parse(data, lexer=self.lexer.lexer)
+        # A clone starts at line 1 whatever was parsed before
+        lexer = self.lexer.lexer.clone()
+        with self.lock:
+            return self.parser.parse(data, lexer=lexer)
 
     # Grammar rules
     def p_program(self, p):
@@ -262,3 +288,16 @@ class AWKParser:
                 f"Syntax error at '{p.value}' on line {p.lineno}")
         else:
             raise SyntaxError("Syntax error at EOF")
+
+
+def write_tables() -> None:
+    # Regenerates parsetab.py next to this module
+    yacc.yacc(module=AWKParser.__new__(AWKParser),
+              start='program',
+              tabmodule='parsetab',
+              outputdir=os.path.dirname(os.path.abspath(__file__)),
+              debug=False)
+
+
+if __name__ == '__main__':
+    write_tables()
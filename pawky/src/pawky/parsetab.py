@@ -0,0 +1,94 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'programleftORleftANDleftEQNEQleftLTLTEGTGTEleftPLUSMINUSleftTIMESDIVIDEMODrightNOTrightUMINUSAND ASSIGN BEGIN BREAK COMMA DECREMENT DIVIDE DIVIDE_ASSIGN DOLLAR ELSE END EQ FOR GT GTE IDENTIFIER IF INCREMENT LBRACE LPAREN LT LTE MINUS MINUS_ASSIGN MOD MOD_ASSIGN NEQ NOT NUMBER OR PLUS PLUS_ASSIGN PRINT RBRACE RPAREN SEMICOLON STRING TIMES TIMES_ASSIGN\n        program : blocks\n        \n        blocks : blocks block\n               | block\n        \n        block : BEGIN LBRACE statements RBRACE\n              | END LBRACE statements RBRACE\n              | pattern LBRACE statements RBRACE\n              | LBRACE statements RBRACE\n        \n        pattern : expression\n        \n        statements : statements statement\n                   | statement\n        \n        statement : print_statement\n                  | assignment\n                  | if_statement\n                  | for_loop\n                  | break_statement\n                  | increment_operation\n                  | block\n                  | SEMICOLON\n        \n        print_statement : PRINT expressions\n        \n        expressions : expressions COMMA expression\n                    | expression\n        \n        assignment : IDENTIFIER ASSIGN expression\n                   | IDENTIFIER PLUS_ASSIGN expression\n                   | IDENTIFIER MINUS_ASSIGN expression\n                   | IDENTIFIER TIMES_ASSIGN expression\n                   | IDENTIFIER DIVIDE_ASSIGN expression\n                   | IDENTIFIER MOD_ASSIGN expression\n        \n        if_statement : IF LPAREN expression RPAREN statement\n                     | IF LPAREN expression RPAREN statement ELSE statement\n        \n        for_loop : FOR LPAREN for_init SEMICOLON for_condition SEMICOLON for_increment RPAREN statement\n        \n        for_init : assignment\n                 | SEMICOLON\n        \n        for_condition : expression\n                      | SEMICOLON\n        \n        for_increment : assignment\n                      | increment_operation\n                      | SEMICOLON\n        \n        break_statement : BREAK SEMICOLON\n        \n        increment_operation : INCREMENT IDENTIFIER\n                            | DECREMENT IDENTIFIER\n                            | IDENTIFIER INCREMENT\n                            | IDENTIFIER DECREMENT\n        \n        expression : expression PLUS expression\n                   | expression MINUS expression\n                   | expression TIMES expression\n                   | expression DIVIDE expression\n                   | expression MOD expression\n                   | expression EQ expression\n                   | expression NEQ expression\n                   | expression LT expression\n                   | expression LTE expression\n                   | expression GT expression\n                   | expression GTE expression\n                   | expression AND expression\n                   | expression OR expression\n        \n        expression : NOT expression\n                   | MINUS expression %prec UMINUS\n        \n        expression : LPAREN expression RPAREN\n        \n        expression : NUMBER\n                   | STRING\n        expression : IDENTIFIER\n        \n        expression : DOLLAR field_index\n        \n        field_index : NUMBER\n        \n        field_index : IDENTIFIER\n        '
+    
+_lr_action_items = {'BEGIN':([0,2,3,5,12,13,14,16,17,18,19,20,21,22,23,24,25,26,27,35,36,50,51,53,54,55,56,57,58,59,60,67,68,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,92,93,94,95,96,97,103,104,105,106,108,112,114,120,121,],[4,4,-3,4,-59,-60,-61,-2,4,4,-10,-11,-12,-13,-14,-15,-16,-17,-18,4,4,-57,-56,-62,-63,-64,4,-7,-9,-19,-21,-41,-42,-38,-39,-40,4,4,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,-22,-23,-24,-25,-26,-27,-5,-6,-20,4,-28,4,-29,4,-30,]),'END':([0,2,3,5,12,13,14,16,17,18,19,20,21,22,23,24,25,26,27,35,36,50,51,53,54,55,56,57,58,59,60,67,68,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,92,93,94,95,96,97,103,104,105,106,108,112,114,120,121,],[6,6,-3,6,-59,-60,-61,-2,6,6,-10,-11,-12,-13,-14,-15,-16,-17,-18,6,6,-57,-56,-62,-63,-64,6,-7,-9,-19,-21,-41,-42,-38,-39,-40,6,6,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,-22,-23,-24,-25,-26,-27,-5,-6,-20,6,-28,6,-29,6,-30,]),'LBRACE':([0,2,3,4,5,6,7,8,12,13,14,16,17,18,19,20,21,22,23,24,25,26,27,29,35,36,50,51,53,54,55,56,57,58,59,60,67,68,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,92,93,94,95,96,97,103,104,105,106,108,112,114,120,121,],[5,5,-3,17,5,35,36,-8,-59,-60,-61,-2,5,5,-10,-11,-12,-13,-14,-15,-16,-17,-18,-61,5,5,-57,-56,-62,-63,-64,5,-7,-9,-19,-21,-41,-42,-38,-39,-40,5,5,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,-22,-23,-24,-25,-26,-27,-5,-6,-20,5,-28,5,-29,5,-30,]),'NOT':([0,2,3,5,9,10,11,12,13,14,16,17,18,19,20,21,22,23,24,25,26,27,28,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,103,104,105,106,107,108,112,114,120,121,],[10,10,-3,10,10,10,10,-59,-60,-61,-2,10,10,-10,-11,-12,-13,-14,-15,-16,-17,-18,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,10,-57,-56,-62,-63,-64,10,-7,-9,-19,-21,10,10,10,10,10,10,-41,-42,10,-38,-39,-40,10,10,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,10,-22,-23,-24,-25,-26,-27,-5,-6,-20,10,10,-28,10,-29,10,-30,]),'MINUS':([0,2,3,5,8,9,10,11,12,13,14,16,17,18,19,20,21,22,23,24,25,26,27,28,29,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,103,104,105,106,107,108,111,112,114,120,121,],[9,9,-3,9,38,9,9,9,-59,-60,-61,-2,9,9,-10,-11,-12,-13,-14,-15,-16,-17,-18,9,-61,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,-57,-56,38,-62,-63,-64,9,-7,-9,-19,38,9,9,9,9,9,9,-41,-42,9,-38,-39,-40,9,9,-43,-44,-45,-46,-47,38,38,38,38,38,38,38,38,-58,-4,9,38,38,38,38,38,38,38,-5,-6,38,9,9,-28,38,9,-29,9,-30,]),'LPAREN':([0,2,3,5,9,10,11,12,13,14,16,17,18,19,20,21,22,23,24,25,26,27,28,30,31,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,103,104,105,106,107,108,112,114,120,121,],[11,11,-3,11,11,11,11,-59,-60,-61,-2,11,11,-10,-11,-12,-13,-14,-15,-16,-17,-18,11,69,70,11,11,11,11,11,11,11,11,11,11,11,11,11,11,11,-57,-56,-62,-63,-64,11,-7,-9,-19,-21,11,11,11,11,11,11,-41,-42,11,-38,-39,-40,11,11,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,11,-22,-23,-24,-25,-26,-27,-5,-6,-20,11,11,-28,11,-29,11,-30,]),'NUMBER':([0,2,3,5,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,103,104,105,106,107,108,112,114,120,121,],[12,12,-3,12,12,12,12,-59,-60,-61,54,-2,12,12,-10,-11,-12,-13,-14,-15,-16,-17,-18,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,-57,-56,-62,-63,-64,12,-7,-9,-19,-21,12,12,12,12,12,12,-41,-42,12,-38,-39,-40,12,12,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,12,-22,-23,-24,-25,-26,-27,-5,-6,-20,12,12,-28,12,-29,12,-30,]),'STRING':([0,2,3,5,9,10,11,12,13,14,16,17,18,19,20,21,22,23,24,25,26,27,28,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,103,104,105,106,107,108,112,114,120,121,],[13,13,-3,13,13,13,13,-59,-60,-61,-2,13,13,-10,-11,-12,-13,-14,-15,-16,-17,-18,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,-57,-56,-62,-63,-64,13,-7,-9,-19,-21,13,13,13,13,13,13,-41,-42,13,-38,-39,-40,13,13,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,13,-22,-23,-24,-25,-26,-27,-5,-6,-20,13,13,-28,13,-29,13,-30,]),'IDENTIFIER':([0,2,3,5,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,103,104,105,106,107,108,112,113,114,120,121,],[14,14,-3,29,14,14,14,-59,-60,-61,55,-2,29,29,-10,-11,-12,-13,-14,-15,-16,-17,-18,14,72,73,29,29,14,14,14,14,14,14,14,14,14,14,14,14,14,-57,-56,-62,-63,-64,29,-7,-9,-19,-21,14,14,14,14,14,14,-41,-42,14,102,-38,-39,-40,29,29,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,14,-22,-23,-24,-25,-26,-27,-5,-6,-20,29,14,-28,29,119,-29,29,-30,]),'DOLLAR':([0,2,3,5,9,10,11,12,13,14,16,17,18,19,20,21,22,23,24,25,26,27,28,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,103,104,105,106,107,108,112,114,120,121,],[15,15,-3,15,15,15,15,-59,-60,-61,-2,15,15,-10,-11,-12,-13,-14,-15,-16,-17,-18,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,-57,-56,-62,-63,-64,15,-7,-9,-19,-21,15,15,15,15,15,15,-41,-42,15,-38,-39,-40,15,15,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,15,-22,-23,-24,-25,-26,-27,-5,-6,-20,15,15,-28,15,-29,15,-30,]),'$end':([1,2,3,16,57,90,103,104,],[0,-1,-3,-2,-7,-4,-5,-6,]),'SEMICOLON':([5,12,13,14,17,18,19,20,21,22,23,24,25,26,27,32,35,36,50,51,53,54,55,56,57,58,59,60,67,68,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,92,93,94,95,96,97,99,100,101,103,104,105,106,107,108,109,110,111,112,113,114,120,121,],[27,-59,-60,-61,27,27,-10,-11,-12,-13,-14,-15,-16,-17,-18,71,27,27,-57,-56,-62,-63,-64,27,-7,-9,-19,-21,-41,-42,100,-38,-39,-40,27,27,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,-22,-23,-24,-25,-26,-27,107,-32,-31,-5,-6,-20,27,109,-28,-34,113,-33,27,115,-29,27,-30,]),'PRINT':([5,12,13,14,17,18,19,20,21,22,23,24,25,26,27,35,36,50,51,53,54,55,56,57,58,59,60,67,68,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,92,93,94,95,96,97,103,104,105,106,108,112,114,120,121,],[28,-59,-60,-61,28,28,-10,-11,-12,-13,-14,-15,-16,-17,-18,28,28,-57,-56,-62,-63,-64,28,-7,-9,-19,-21,-41,-42,-38,-39,-40,28,28,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,-22,-23,-24,-25,-26,-27,-5,-6,-20,28,-28,28,-29,28,-30,]),'IF':([5,12,13,14,17,18,19,20,21,22,23,24,25,26,27,35,36,50,51,53,54,55,56,57,58,59,60,67,68,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,92,93,94,95,96,97,103,104,105,106,108,112,114,120,121,],[30,-59,-60,-61,30,30,-10,-11,-12,-13,-14,-15,-16,-17,-18,30,30,-57,-56,-62,-63,-64,30,-7,-9,-19,-21,-41,-42,-38,-39,-40,30,30,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,-22,-23,-24,-25,-26,-27,-5,-6,-20,30,-28,30,-29,30,-30,]),'FOR':([5,12,13,14,17,18,19,20,21,22,23,24,25,26,27,35,36,50,51,53,54,55,56,57,58,59,60,67,68,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,92,93,94,95,96,97,103,104,105,106,108,112,114,120,121,],[31,-59,-60,-61,31,31,-10,-11,-12,-13,-14,-15,-16,-17,-18,31,31,-57,-56,-62,-63,-64,31,-7,-9,-19,-21,-41,-42,-38,-39,-40,31,31,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,-22,-23,-24,-25,-26,-27,-5,-6,-20,31,-28,31,-29,31,-30,]),'BREAK':([5,12,13,14,17,18,19,20,21,22,23,24,25,26,27,35,36,50,51,53,54,55,56,57,58,59,60,67,68,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,92,93,94,95,96,97,103,104,105,106,108,112,114,120,121,],[32,-59,-60,-61,32,32,-10,-11,-12,-13,-14,-15,-16,-17,-18,32,32,-57,-56,-62,-63,-64,32,-7,-9,-19,-21,-41,-42,-38,-39,-40,32,32,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,-22,-23,-24,-25,-26,-27,-5,-6,-20,32,-28,32,-29,32,-30,]),'INCREMENT':([5,12,13,14,17,18,19,20,21,22,23,24,25,26,27,29,35,36,50,51,53,54,55,56,57,58,59,60,67,68,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,92,93,94,95,96,97,103,104,105,106,108,112,113,114,119,120,121,],[33,-59,-60,-61,33,33,-10,-11,-12,-13,-14,-15,-16,-17,-18,67,33,33,-57,-56,-62,-63,-64,33,-7,-9,-19,-21,-41,-42,-38,-39,-40,33,33,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,-22,-23,-24,-25,-26,-27,-5,-6,-20,33,-28,33,33,-29,67,33,-30,]),'DECREMENT':([5,12,13,14,17,18,19,20,21,22,23,24,25,26,27,29,35,36,50,51,53,54,55,56,57,58,59,60,67,68,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,92,93,94,95,96,97,103,104,105,106,108,112,113,114,119,120,121,],[34,-59,-60,-61,34,34,-10,-11,-12,-13,-14,-15,-16,-17,-18,68,34,34,-57,-56,-62,-63,-64,34,-7,-9,-19,-21,-41,-42,-38,-39,-40,34,34,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,-22,-23,-24,-25,-26,-27,-5,-6,-20,34,-28,34,34,-29,68,34,-30,]),'PLUS':([8,12,13,14,29,50,51,52,53,54,55,60,76,77,78,79,80,81,82,83,84,85,86,87,88,89,92,93,94,95,96,97,98,105,111,],[37,-59,-60,-61,-61,-57,-56,37,-62,-63,-64,37,-43,-44,-45,-46,-47,37,37,37,37,37,37,37,37,-58,37,37,37,37,37,37,37,37,37,]),'TIMES':([8,12,13,14,29,50,51,52,53,54,55,60,76,77,78,79,80,81,82,83,84,85,86,87,88,89,92,93,94,95,96,97,98,105,111,],[39,-59,-60,-61,-61,-57,-56,39,-62,-63,-64,39,39,39,-45,-46,-47,39,39,39,39,39,39,39,39,-58,39,39,39,39,39,39,39,39,39,]),'DIVIDE':([8,12,13,14,29,50,51,52,53,54,55,60,76,77,78,79,80,81,82,83,84,85,86,87,88,89,92,93,94,95,96,97,98,105,111,],[40,-59,-60,-61,-61,-57,-56,40,-62,-63,-64,40,40,40,-45,-46,-47,40,40,40,40,40,40,40,40,-58,40,40,40,40,40,40,40,40,40,]),'MOD':([8,12,13,14,29,50,51,52,53,54,55,60,76,77,78,79,80,81,82,83,84,85,86,87,88,89,92,93,94,95,96,97,98,105,111,],[41,-59,-60,-61,-61,-57,-56,41,-62,-63,-64,41,41,41,-45,-46,-47,41,41,41,41,41,41,41,41,-58,41,41,41,41,41,41,41,41,41,]),'EQ':([8,12,13,14,29,50,51,52,53,54,55,60,76,77,78,79,80,81,82,83,84,85,86,87,88,89,92,93,94,95,96,97,98,105,111,],[42,-59,-60,-61,-61,-57,-56,42,-62,-63,-64,42,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,42,42,-58,42,42,42,42,42,42,42,42,42,]),'NEQ':([8,12,13,14,29,50,51,52,53,54,55,60,76,77,78,79,80,81,82,83,84,85,86,87,88,89,92,93,94,95,96,97,98,105,111,],[43,-59,-60,-61,-61,-57,-56,43,-62,-63,-64,43,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,43,43,-58,43,43,43,43,43,43,43,43,43,]),'LT':([8,12,13,14,29,50,51,52,53,54,55,60,76,77,78,79,80,81,82,83,84,85,86,87,88,89,92,93,94,95,96,97,98,105,111,],[44,-59,-60,-61,-61,-57,-56,44,-62,-63,-64,44,-43,-44,-45,-46,-47,44,44,-50,-51,-52,-53,44,44,-58,44,44,44,44,44,44,44,44,44,]),'LTE':([8,12,13,14,29,50,51,52,53,54,55,60,76,77,78,79,80,81,82,83,84,85,86,87,88,89,92,93,94,95,96,97,98,105,111,],[45,-59,-60,-61,-61,-57,-56,45,-62,-63,-64,45,-43,-44,-45,-46,-47,45,45,-50,-51,-52,-53,45,45,-58,45,45,45,45,45,45,45,45,45,]),'GT':([8,12,13,14,29,50,51,52,53,54,55,60,76,77,78,79,80,81,82,83,84,85,86,87,88,89,92,93,94,95,96,97,98,105,111,],[46,-59,-60,-61,-61,-57,-56,46,-62,-63,-64,46,-43,-44,-45,-46,-47,46,46,-50,-51,-52,-53,46,46,-58,46,46,46,46,46,46,46,46,46,]),'GTE':([8,12,13,14,29,50,51,52,53,54,55,60,76,77,78,79,80,81,82,83,84,85,86,87,88,89,92,93,94,95,96,97,98,105,111,],[47,-59,-60,-61,-61,-57,-56,47,-62,-63,-64,47,-43,-44,-45,-46,-47,47,47,-50,-51,-52,-53,47,47,-58,47,47,47,47,47,47,47,47,47,]),'AND':([8,12,13,14,29,50,51,52,53,54,55,60,76,77,78,79,80,81,82,83,84,85,86,87,88,89,92,93,94,95,96,97,98,105,111,],[48,-59,-60,-61,-61,-57,-56,48,-62,-63,-64,48,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,48,-58,48,48,48,48,48,48,48,48,48,]),'OR':([8,12,13,14,29,50,51,52,53,54,55,60,76,77,78,79,80,81,82,83,84,85,86,87,88,89,92,93,94,95,96,97,98,105,111,],[49,-59,-60,-61,-61,-57,-56,49,-62,-63,-64,49,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,49,49,49,49,49,49,49,49,49,]),'RPAREN':([12,13,14,50,51,52,53,54,55,67,68,72,73,76,77,78,79,80,81,82,83,84,85,86,87,88,89,92,93,94,95,96,97,98,115,116,117,118,],[-59,-60,-61,-57,-56,89,-62,-63,-64,-41,-42,-39,-40,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-22,-23,-24,-25,-26,-27,106,-37,120,-35,-36,]),'COMMA':([12,13,14,50,51,53,54,55,59,60,76,77,78,79,80,81,82,83,84,85,86,87,88,89,105,],[-59,-60,-61,-57,-56,-62,-63,-64,91,-21,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-20,]),'RBRACE':([12,13,14,18,19,20,21,22,23,24,25,26,27,50,51,53,54,55,56,57,58,59,60,67,68,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,92,93,94,95,96,97,103,104,105,108,114,121,],[-59,-60,-61,57,-10,-11,-12,-13,-14,-15,-16,-17,-18,-57,-56,-62,-63,-64,90,-7,-9,-19,-21,-41,-42,-38,-39,-40,103,104,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,-22,-23,-24,-25,-26,-27,-5,-6,-20,-28,-29,-30,]),'ELSE':([12,13,14,20,21,22,23,24,25,26,27,50,51,53,54,55,57,59,60,67,68,71,72,73,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,92,93,94,95,96,97,103,104,105,108,114,121,],[-59,-60,-61,-11,-12,-13,-14,-15,-16,-17,-18,-57,-56,-62,-63,-64,-7,-19,-21,-41,-42,-38,-39,-40,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-54,-55,-58,-4,-22,-23,-24,-25,-26,-27,-5,-6,-20,112,-29,-30,]),'ASSIGN':([29,102,119,],[61,61,61,]),'PLUS_ASSIGN':([29,102,119,],[62,62,62,]),'MINUS_ASSIGN':([29,102,119,],[63,63,63,]),'TIMES_ASSIGN':([29,102,119,],[64,64,64,]),'DIVIDE_ASSIGN':([29,102,119,],[65,65,65,]),'MOD_ASSIGN':([29,102,119,],[66,66,66,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'blocks':([0,],[2,]),'block':([0,2,5,17,18,35,36,56,74,75,106,112,120,],[3,16,26,26,26,26,26,26,26,26,26,26,26,]),'pattern':([0,2,5,17,18,35,36,56,74,75,106,112,120,],[7,7,7,7,7,7,7,7,7,7,7,7,7,]),'expression':([0,2,5,9,10,11,17,18,28,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,56,61,62,63,64,65,66,69,74,75,91,106,107,112,120,],[8,8,8,50,51,52,8,8,60,8,8,76,77,78,79,80,81,82,83,84,85,86,87,88,8,92,93,94,95,96,97,98,8,8,105,8,111,8,8,]),'statements':([5,17,35,36,],[18,56,74,75,]),'statement':([5,17,18,35,36,56,74,75,106,112,120,],[19,19,58,19,19,58,58,58,108,114,121,]),'print_statement':([5,17,18,35,36,56,74,75,106,112,120,],[20,20,20,20,20,20,20,20,20,20,20,]),'assignment':([5,17,18,35,36,56,70,74,75,106,112,113,120,],[21,21,21,21,21,21,101,21,21,21,21,117,21,]),'if_statement':([5,17,18,35,36,56,74,75,106,112,120,],[22,22,22,22,22,22,22,22,22,22,22,]),'for_loop':([5,17,18,35,36,56,74,75,106,112,120,],[23,23,23,23,23,23,23,23,23,23,23,]),'break_statement':([5,17,18,35,36,56,74,75,106,112,120,],[24,24,24,24,24,24,24,24,24,24,24,]),'increment_operation':([5,17,18,35,36,56,74,75,106,112,113,120,],[25,25,25,25,25,25,25,25,25,25,118,25,]),'field_index':([15,],[53,]),'expressions':([28,],[59,]),'for_init':([70,],[99,]),'for_condition':([107,],[110,]),'for_increment':([113,],[116,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> blocks','program',1,'p_program','parser.py',44),
+  ('blocks -> blocks block','blocks',2,'p_blocks','parser.py',50),
+  ('blocks -> block','blocks',1,'p_blocks','parser.py',51),
+  ('block -> BEGIN LBRACE statements RBRACE','block',4,'p_block','parser.py',61),
+  ('block -> END LBRACE statements RBRACE','block',4,'p_block','parser.py',62),
+  ('block -> pattern LBRACE statements RBRACE','block',4,'p_block','parser.py',63),
+  ('block -> LBRACE statements RBRACE','block',3,'p_block','parser.py',64),
+  ('pattern -> expression','pattern',1,'p_pattern','parser.py',76),
+  ('statements -> statements statement','statements',2,'p_statements','parser.py',82),
+  ('statements -> statement','statements',1,'p_statements','parser.py',83),
+  ('statement -> print_statement','statement',1,'p_statement','parser.py',96),
+  ('statement -> assignment','statement',1,'p_statement','parser.py',97),
+  ('statement -> if_statement','statement',1,'p_statement','parser.py',98),
+  ('statement -> for_loop','statement',1,'p_statement','parser.py',99),
+  ('statement -> break_statement','statement',1,'p_statement','parser.py',100),
+  ('statement -> increment_operation','statement',1,'p_statement','parser.py',101),
+  ('statement -> block','statement',1,'p_statement','parser.py',102),
+  ('statement -> SEMICOLON','statement',1,'p_statement','parser.py',103),
+  ('print_statement -> PRINT expressions','print_statement',2,'p_print_statement','parser.py',112),
+  ('expressions -> expressions COMMA expression','expressions',3,'p_expressions','parser.py',118),
+  ('expressions -> expression','expressions',1,'p_expressions','parser.py',119),
+  ('assignment -> IDENTIFIER ASSIGN expression','assignment',3,'p_assignment','parser.py',129),
+  ('assignment -> IDENTIFIER PLUS_ASSIGN expression','assignment',3,'p_assignment','parser.py',130),
+  ('assignment -> IDENTIFIER MINUS_ASSIGN expression','assignment',3,'p_assignment','parser.py',131),
+  ('assignment -> IDENTIFIER TIMES_ASSIGN expression','assignment',3,'p_assignment','parser.py',132),
+  ('assignment -> IDENTIFIER DIVIDE_ASSIGN expression','assignment',3,'p_assignment','parser.py',133),
+  ('assignment -> IDENTIFIER MOD_ASSIGN expression','assignment',3,'p_assignment','parser.py',134),
+  ('if_statement -> IF LPAREN expression RPAREN statement','if_statement',5,'p_if_statement','parser.py',140),
+  ('if_statement -> IF LPAREN expression RPAREN statement ELSE statement','if_statement',7,'p_if_statement','parser.py',141),
+  ('for_loop -> FOR LPAREN for_init SEMICOLON for_condition SEMICOLON for_increment RPAREN statement','for_loop',9,'p_for_loop','parser.py',150),
+  ('for_init -> assignment','for_init',1,'p_for_init','parser.py',162),
+  ('for_init -> SEMICOLON','for_init',1,'p_for_init','parser.py',163),
+  ('for_condition -> expression','for_condition',1,'p_for_condition','parser.py',172),
+  ('for_condition -> SEMICOLON','for_condition',1,'p_for_condition','parser.py',173),
+  ('for_increment -> assignment','for_increment',1,'p_for_increment','parser.py',182),
+  ('for_increment -> increment_operation','for_increment',1,'p_for_increment','parser.py',183),
+  ('for_increment -> SEMICOLON','for_increment',1,'p_for_increment','parser.py',184),
+  ('break_statement -> BREAK SEMICOLON','break_statement',2,'p_break_statement','parser.py',193),
+  ('increment_operation -> INCREMENT IDENTIFIER','increment_operation',2,'p_increment_operation','parser.py',199),
+  ('increment_operation -> DECREMENT IDENTIFIER','increment_operation',2,'p_increment_operation','parser.py',200),
+  ('increment_operation -> IDENTIFIER INCREMENT','increment_operation',2,'p_increment_operation','parser.py',201),
+  ('increment_operation -> IDENTIFIER DECREMENT','increment_operation',2,'p_increment_operation','parser.py',202),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','parser.py',211),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','parser.py',212),
+  ('expression -> expression TIMES expression','expression',3,'p_expression_binop','parser.py',213),
+  ('expression -> expression DIVIDE expression','expression',3,'p_expression_binop','parser.py',214),
+  ('expression -> expression MOD expression','expression',3,'p_expression_binop','parser.py',215),
+  ('expression -> expression EQ expression','expression',3,'p_expression_binop','parser.py',216),
+  ('expression -> expression NEQ expression','expression',3,'p_expression_binop','parser.py',217),
+  ('expression -> expression LT expression','expression',3,'p_expression_binop','parser.py',218),
+  ('expression -> expression LTE expression','expression',3,'p_expression_binop','parser.py',219),
+  ('expression -> expression GT expression','expression',3,'p_expression_binop','parser.py',220),
+  ('expression -> expression GTE expression','expression',3,'p_expression_binop','parser.py',221),
+  ('expression -> expression AND expression','expression',3,'p_expression_binop','parser.py',222),
+  ('expression -> expression OR expression','expression',3,'p_expression_binop','parser.py',223),
+  ('expression -> NOT expression','expression',2,'p_expression_unary','parser.py',229),
+  ('expression -> MINUS expression','expression',2,'p_expression_unary','parser.py',230),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','parser.py',236),
+  ('expression -> NUMBER','expression',1,'p_expression_literal','parser.py',242),
+  ('expression -> STRING','expression',1,'p_expression_literal','parser.py',243),
+  ('expression -> IDENTIFIER','expression',1,'p_expression_variable','parser.py',248),
+  ('expression -> DOLLAR field_index','expression',2,'p_expression_field','parser.py',254),
+  ('field_index -> NUMBER','field_index',1,'p_field_index_number','parser.py',260),
+  ('field_index -> IDENTIFIER','field_index',1,'p_field_index_variable','parser.py',266),
+]
@@ -0,0 +1,99 @@
+import codecs
+import queue
+import sys
+import threading
+from typing import Any, Iterable, Iterator
+
+CHUNK_SIZE = 1 << 20
+# Decoded chunks the background reader may get ahead by
+READ_AHEAD_DEPTH = 8
+STDIN = '-'
+
+
+def read_records(chunks: Iterable[str], separator: str) -> Iterator[str]:
+    # Only the trailing partial record is carried between chunks, so the
+    # input never has to be materialized as one string. Its pieces are
+    # joined only once a separator arrives, so a long record costs linear
+    # time however many chunks it spans.
+    pending: list[str] = []
+    tail = ""  # Last few characters of `pending`
+    overlap = len(separator) - 1
+    for chunk in chunks:
+        if separator not in tail + chunk:
+            pending.append(chunk)
+            if overlap:
+                tail = (tail + chunk)[-overlap:]
+            continue
+        records = ("".join(pending) + chunk).split(separator)
+        pending = [records.pop()]
+        tail = pending[0][-overlap:] if overlap else ""
+        yield from records
+    yield "".join(pending)
+
+
+class ReadAhead:
+    """
+    Reads and decodes files in order on a background thread.
+
+    Iterating yields (index, path, chunk) for every chunk of every file,
+    at least one per file, while the thread keeps up to `depth` chunks
+    ready so disk reads overlap with processing. `-` is stdin.
+    """
+
+    def __init__(self,
+                 paths: list[str],
+                 encoding: str = 'utf-8',
+                 chunk_size: int = CHUNK_SIZE,
+                 depth: int = READ_AHEAD_DEPTH) -> None:
+        self.paths = paths
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.queue: queue.Queue[Any] = queue.Queue(depth)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.read, daemon=True)
+        self.thread.start()
+
+    def read(self) -> None:
+        try:
+            for index, path in enumerate(self.paths):
+                if path == STDIN:
+                    self.read_file(index, path, sys.stdin.buffer)
+                else:
+                    with open(path, 'rb', buffering=0) as f:
+                        self.read_file(index, path, f)
+                if self.stopped.is_set():
+                    return
+        except Exception as e:
+            # Raised in the consumer once it gets this far
+            self.put(e)
+        self.put(None)
+
+    def read_file(self, index: int, path: str, f) -> None:
+        # A character split between chunks is held back by the decoder
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+        while block := f.read(self.chunk_size):
+            if not self.put((index, path, decoder.decode(block))):
+                return
+        self.put((index, path, decoder.decode(b'', final=True)))
+
+    def put(self, item: Any) -> bool:
+        # Waits for room unless the consumer went away
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def __iter__(self) -> Iterator[tuple[int, str, str]]:
+        try:
+            while (item := self.queue.get()) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.stopped.set()
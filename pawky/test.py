@@ -1,7 +1,20 @@
+import os
+import subprocess
+import sys
+import tempfile
+
 from pawky import AWKInterpreter
+from pawky.follow import LogFollower
+
+try:
+    import pyarrow as pa
 
+    from pawky.arrow import iter_record_batches
+except ImportError:  # The optional 'arrow' extra
+    pa = None
 
-def run_test(title: str, awk_script: str, input_data: str) -> None:
+
+def run_test(title: str, awk_script: str, input_data: str | list[str]) -> None:
     print(f"\n=== {title} ===")
     interpreter = AWKInterpreter(awk_script)
     interpreter.set_input(input_data)
@@ -96,6 +109,227 @@ cherry,5,red\
     '''
     run_test(title_test4, awk_script_test4, input_data_test4)
 
+    title_test5 = "Case 5: Chunked input with records split across chunks"
+    awk_script_test5 = '''
+    BEGIN {
+        FS = ",";
+        RS = "&&";
+    }
+
+    {
+        print NR, $1 + $2 + $3;
+    }
+    '''
+    input_data_test5 = ["1,2", ",3&", "&4,5,6&&7", ",8,9&&"]
+    run_test(title_test5, awk_script_test5, input_data_test5)
+
+    title_test6 = "Case 6: Print to Arrow record batches"
+    print(f"\n=== {title_test6} ===")
+    awk_script_test6 = '''
+    BEGIN {
+        FS = ",";
+    }
+
+    {
+        print $1, $2, $2 * 1.5;
+    }
+    '''
+    input_data_test6 = '''\
+apple,4
+banana,6
+cherry,5\
+    '''
+    if pa is None:
+        print("Skipped: pyarrow is not installed")
+    else:
+        interpreter = AWKInterpreter(awk_script_test6)
+        interpreter.set_input(input_data_test6)
+        batches = list(iter_record_batches(interpreter, batch_size=2))
+        for batch in batches:
+            print(batch.schema.types, batch.to_pydict())
+        # Every batch has the schema of the first, so they form one table
+        print(pa.Table.from_batches(batches).num_rows)
+
+        # Later batches widen the types of earlier ones: ints to floats,
+        # numbers to text, and columns with only nulls to anything
+        interpreter = AWKInterpreter('''
+        BEGIN {
+            FS = ",";
+        }
+
+        {
+            if (NR > 2) {
+                print $1, $3, $2;
+            } else {
+                print $1, $3;
+            }
+        }
+        ''')
+        interpreter.set_input("1,a,1\n2,b,2\n4.5,c,x\n6,d,4")
+        batches = list(iter_record_batches(interpreter, batch_size=2))
+        table = pa.Table.from_batches(batches)
+        print(table.schema.types, table.to_pydict())
+
+        # A schema is kept as given, and values that do not fit are errors
+        for input_data in ["1\n2.5", "1\n1.e999"]:
+            interpreter = AWKInterpreter("{ print $1; }")
+            interpreter.set_input(input_data)
+            try:
+                list(
+                    iter_record_batches(
+                        interpreter,
+                        schema=pa.schema([pa.field("n", pa.int64())])))
+            except ValueError as e:
+                print(e)
+
+    title_test7 = "Case 7: Follow a growing log file"
+    print(f"\n=== {title_test7} ===")
+    awk_script_test7 = '''
+    BEGIN {
+        FS = ",";
+    }
+
+    {
+        total += $2;
+    }
+
+    END {
+        print NR, total;
+    }
+    '''
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = os.path.join(directory, "app.log")
+        state_path = os.path.join(directory, "app.state.json")
+        for data, mode in [("a,1\nb,2\nc,", 'w'), ("3\n", 'a'), ("d,4\n", 'a'),
+                           ("e,5\n", 'w')]:
+            with open(log_path, mode) as f:
+                f.write(data)
+            LogFollower(AWKInterpreter(awk_script_test7), log_path,
+                        state_path).run()
+
+        # Interrupted mid-chunk, the snapshot holds only the records before
+        # the interrupt, and the empty record is not counted
+        with open(log_path, 'w') as f:
+            f.write("a,1\n\nb,2\nc,3\n")
+        os.remove(state_path)
+        interpreter = AWKInterpreter(awk_script_test7)
+        process_record = interpreter.process_record
+
+        def interrupt(record: str) -> bool:
+            if record.startswith("c"):
+                raise KeyboardInterrupt
+            return process_record(record)
+
+        interpreter.process_record = interrupt
+        LogFollower(interpreter, log_path, state_path).follow(max_polls=1)
+        follower = LogFollower(AWKInterpreter(awk_script_test7), log_path,
+                               state_path)
+        follower.restore()
+        print(follower.poll())
+        follower.interpreter.run_end()
+
+        # A snapshot of another log is not applied to this one
+        other_path = os.path.join(directory, "other.log")
+        with open(other_path, 'w') as f:
+            f.write("x,1\n")
+        try:
+            LogFollower(AWKInterpreter(awk_script_test7), other_path,
+                        state_path).run()
+        except ValueError as e:
+            print(str(e).replace(directory, "..."))
+
+        # Records longer than a chunk, and separators split between chunks
+        with open(other_path, 'w') as f:
+            f.write("aaaaaaaa,1&&bbbbbbbb,2&&c,")
+        os.remove(state_path)
+        interpreter = AWKInterpreter(awk_script_test7)
+        interpreter.builtins['RS'] = "&&"
+        LogFollower(interpreter, other_path, state_path, chunk_size=3).run()
+
+    title_test8 = "Case 8: Numeric and string comparisons"
+    awk_script_test8 = '''
+    BEGIN {
+        FS = ",";
+        print "10" < 9, 10 < 9, "abc" + 1;
+    }
+
+    {
+        if ($2 < 9) {
+            print $1, $2, "below";
+        } else {
+            print $1, $2, "not below";
+        }
+    }
+    '''
+    input_data_test8 = '''\
+a,007
+b,10
+c,abc
+d,1.50\
+    '''
+    run_test(title_test8, awk_script_test8, input_data_test8)
+
+    title_test9 = "Case 9: Command line with -F, -v and several files"
+    print(f"\n=== {title_test9} ===")
+    awk_script_test9 = '{ total += $2; print $1, $2 * scale; } END { print NR, total; }'
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for name, data in [("a.csv", "a;1\nb;2\n"), ("b.csv", "c;3")]:
+            paths.append(os.path.join(directory, name))
+            with open(paths[-1], 'w') as f:
+                f.write(data)
+        result = subprocess.run([
+            sys.executable, '-m', 'pawky', '-F;', '-v', 'scale=10',
+            awk_script_test9, *paths
+        ],
+                                capture_output=True,
+                                text=True)
+        print(result.stdout, end="")
+        result = subprocess.run(
+            [sys.executable, '-m', 'pawky', '{ print $1 }', paths[0] + 'x'],
+            capture_output=True,
+            text=True)
+        print(result.returncode, result.stderr.startswith("pawky: "))
+        # Values are unescaped as in AWK, and FS stays a string
+        result = subprocess.run([
+            sys.executable, '-m', 'pawky', '-F', '\\t', '-v', 'OFS=\\057',
+            '{ print $2, $1; }'
+        ],
+                                input="a\tb\n",
+                                capture_output=True,
+                                text=True)
+        print(result.stdout, end="")
+        result = subprocess.run(
+            [sys.executable, '-m', 'pawky', '-v', 'FS=1', '{ print $2; }'],
+            input="a1b\n",
+            capture_output=True,
+            text=True)
+        print(result.stdout, end="")
+
+    title_test10 = "Case 10: Several input files with FILENAME and FNR"
+    print(f"\n=== {title_test10} ===")
+    awk_script_test10 = '''
+    {
+        print FILENAME, NR, FNR, $1;
+    }
+
+    END {
+        print NR, FNR;
+    }
+    '''
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        # The first file lacks a final newline, which must not join its
+        # last record with the first of the next file
+        for name, data in [("1.log", "a\nb"), ("2.log", ""),
+                           ("3.log", "c\nd\ne\n")]:
+            paths.append(os.path.join(directory, name))
+            with open(paths[-1], 'w') as f:
+                f.write(data)
+        interpreter = AWKInterpreter(awk_script_test10)
+        interpreter.set_input_files(paths)
+        interpreter.run()
+
 
 if __name__ == '__main__':
     main()
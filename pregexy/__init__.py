@@ -1,3 +1,17 @@
-from .pregexy import is_match
+from .pattern import (Pattern, compile, findall, finditer, is_match, search)
+from .patternset import PatternSet
+from .stream import Matcher, match_file
 
-__all__ = ['is_match']
+__all__ = [
+    'Matcher', 'Pattern', 'PatternSet', 'compile', 'findall', 'finditer',
+    'is_match', 'match_file', 'match_many', 'search'
+]
+
+
+def __getattr__(name: str):
+    # Batch matching needs NumPy and pyarrow, which take longer to import
+    # than the rest of the package, so they are only loaded when used
+    if name == 'match_many':
+        from .batch import match_many
+        return match_many
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,172 @@
+"""
+Matching one pattern against many strings at once.
+
+The pattern's lazy DFA is completed over character classes: one class per
+literal in the pattern and one for every other character. Then all strings
+advance together, one character position per step. Strings are sorted by
+length, so at each step the strings still running are a prefix of the
+batch and the step is a single NumPy gather.
+
+Characters are read straight from the input buffers without Python-level
+copies:
+
+- Arrow string arrays are read as UTF-8 bytes. This needs an ASCII
+  pattern. Continuation bytes get a class that keeps the state unchanged,
+  so each multi-byte character counts as one step.
+- NumPy unicode arrays are read as a matrix of UTF-32 code points.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+import pyarrow as pa
+
+from .pattern import DEAD, Pattern, compile
+
+OTHER = "\u0080"  # Stands for every character missing from an ASCII pattern
+
+
+def dfa_table(pattern: Pattern, chars: list[str]) -> Optional[np.ndarray]:
+    # table[state, i]: state after reading chars[i]. None when the DFA
+    # outgrows its state cap.
+    rows = []
+    state = 0
+    while state < len(pattern.state_sets):
+        row = []
+        for char in chars:
+            next_state = pattern.transitions[state].get(char)
+            if next_state is None:
+                next_state = pattern.add_transition(state, char)
+                if next_state < 0:
+                    return None
+            row.append(next_state)
+        rows.append(row)
+        state += 1
+    return np.array(rows, dtype=np.int32).reshape(len(rows), len(chars))
+
+
+def run_sorted(table: np.ndarray, start: int, lengths: np.ndarray,
+               classes_at: Any) -> np.ndarray:
+    # Final states of strings sorted by descending length. classes_at(j,
+    # count) gives the classes of character j of the first `count` strings.
+    states = np.full(len(lengths), start, dtype=np.int32)
+    ascending = lengths[::-1]
+    for j in range(int(lengths[0]) if len(lengths) else 0):
+        count = len(lengths) - int(np.searchsorted(ascending, j, "right"))
+        active = states[:count]
+        if not (active != DEAD).any():
+            break
+        active[:] = table[active, classes_at(j, count)]
+    return states
+
+
+def match_arrow(pattern: Pattern, strings: pa.Array) -> Optional[np.ndarray]:
+    chars = pattern.nfa.alphabet()
+    if chars is None or not all(char.isascii() for char in chars):
+        return None
+    table = dfa_table(pattern, chars + [OTHER])
+    if table is None:
+        return None
+    # Continuation bytes leave the state unchanged
+    table = np.column_stack([table, np.arange(len(table), dtype=np.int32)])
+    byte_classes = np.full(256, len(chars), dtype=np.intp)
+    byte_classes[0x80:0xC0] = len(chars) + 1
+    for i, char in enumerate(chars):
+        byte_classes[ord(char)] = i
+
+    if pa.types.is_string(strings.type):
+        offset_type = np.int32
+    elif pa.types.is_large_string(strings.type):
+        offset_type = np.int64
+    else:
+        strings = strings.cast(pa.large_string())
+        offset_type = np.int64
+    _, offsets_buffer, data_buffer = strings.buffers()
+    offsets = np.frombuffer(offsets_buffer,
+                            dtype=offset_type,
+                            count=strings.offset + len(strings) + 1,
+                            offset=0)[strings.offset:]
+    data = (np.frombuffer(data_buffer, dtype=np.uint8)
+            if data_buffer is not None else np.zeros(0, dtype=np.uint8))
+
+    lengths = np.diff(offsets)
+    order = np.argsort(-lengths, kind="stable")
+    starts = offsets[:-1][order]
+
+    def classes_at(j: int, count: int) -> np.ndarray:
+        return byte_classes[data[starts[:count] + j]]
+
+    states = np.empty(len(strings), dtype=np.int32)
+    states[order] = run_sorted(table, pattern.start, lengths[order],
+                               classes_at)
+    result = np.asarray(pattern.accepting)[states]
+    if strings.null_count:
+        result &= strings.is_valid().to_numpy(zero_copy_only=False)
+    return result
+
+
+def match_unicode(pattern: Pattern,
+                  strings: np.ndarray) -> Optional[np.ndarray]:
+    chars = pattern.nfa.alphabet()
+    if chars is None:
+        return None
+    other = next(
+        chr(code) for code in range(0x80, 0x110000) if chr(code) not in chars)
+    table = dfa_table(pattern, chars + [other])
+    if table is None:
+        return None
+    # Code points past the largest literal all share the last slot
+    code_classes = np.full(max(map(ord, chars), default=0) + 2,
+                           len(chars),
+                           dtype=np.intp)
+    for i, char in enumerate(chars):
+        code_classes[ord(char)] = i
+    last = len(code_classes) - 1
+
+    width = strings.dtype.itemsize // 4
+    codes = np.ascontiguousarray(strings).view(np.uint32).reshape(
+        len(strings), width)
+    lengths = np.char.str_len(strings)
+    order = np.argsort(-lengths, kind="stable")
+
+    def classes_at(j: int, count: int) -> np.ndarray:
+        return code_classes[np.minimum(codes[order[:count], j], last)]
+
+    states = np.empty(len(strings), dtype=np.int32)
+    states[order] = run_sorted(table, pattern.start, lengths[order],
+                               classes_at)
+    return np.asarray(pattern.accepting)[states]
+
+
+def match_many(pattern: str | Pattern, strings: Any) -> np.ndarray:
+    """
+    Whether each of `strings` matches `pattern`, as a boolean array.
+
+    `strings` may be a pyarrow string array, a NumPy unicode array of any
+    shape, a pandas Series or any sequence of strings. Missing values never
+    match. The result has the shape of a NumPy input.
+    """
+    if isinstance(pattern, str):
+        pattern = compile(pattern)
+    shape = None
+    if isinstance(strings, np.ndarray) and strings.dtype.kind == "U":
+        shape = strings.shape
+        strings = strings.ravel()
+        result = match_unicode(pattern, strings)
+    else:
+        if isinstance(strings, pa.ChunkedArray):
+            strings = strings.combine_chunks()
+        elif not isinstance(strings, pa.Array):
+            strings = pa.array(strings, type=pa.large_string())
+        result = match_arrow(pattern, strings)
+    if result is None:
+        # Non-ASCII pattern on UTF-8 input, or too many DFA states
+        values = (strings.to_pylist()
+                  if isinstance(strings, pa.Array) else strings.tolist())
+        result = np.fromiter(
+            (s is not None and pattern.fullmatch(s) for s in values),
+            dtype=bool,
+            count=len(values))
+    if shape is not None:
+        result = result.reshape(shape)
+    return result
@@ -0,0 +1,296 @@
+"""
+Benchmark suite for the pregexy engines.
+
+Cases cover the Streamlit demo at its 1000 character limits, random
+pairs, and inputs that are adversarial for one engine or another: long
+star chains, runs of `.*`, near misses that only fail at the last
+character, and patterns that make backtracking engines blow up. Every
+engine is timed on every case it supports, checked against the others,
+and has its peak memory recorded with tracemalloc.
+
+Run with `python -m pregexy.bench`. `--json` writes the results for a
+later run to compare against with `--baseline`.
+"""
+
+import argparse
+import json
+import platform
+import random
+import re
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Optional
+
+from .bitparallel import ShiftAndNFA
+from .glushkov import is_extended
+from .pattern import ENGINES, Pattern
+from .pregexy import compress_expression, is_match, normalize, tokenize
+
+DEMO_TEXT = "mississippiabbcacbbbbbabcbacaaccbabbacbbbacbcbaacacaaccbaabcbaabcbcbcaccbcaabc"
+DEMO_PATTERN = "mis*is*ip*.a*a*.*a*.*a*.b*a*a*.*b*c*b*b*.*ac*.*bc*a*.*a*aa*.*b*.c*.*a*"
+MAX_LENGTH = 1000
+QUICK_MAX_LENGTH = 200
+RANDOM_CASES = 5
+# Backtracking blows up on longer patterns with many `.*`
+MAX_RE_PATTERN_LENGTH = 100
+NORMALIZATION_PATTERNS = [
+    "a*a*a*a*a*a*a*a*a*b",
+    "a*.*a*",
+    ".*a*.*b*.*a*.*b*.*c",
+    "a*aa*aa*aa*aa*aa*b",
+    "..*.*..*.*..*.*..*.*",
+    DEMO_PATTERN,
+]
+
+# Classic patterns that backtrack exponentially on a near miss
+REDOS_PATTERNS = ["(a+)+b", "(a|aa)*b", "(a|a?)+b", "([a-z]+)*[0-9]"]
+# Lengths past this are too slow for `re`
+MAX_RE_REDOS_LENGTH = 22
+# A result slower than the baseline by this factor is a regression, unless
+# the difference is below timer noise
+REGRESSION_THRESHOLD = 1.5
+MIN_REGRESSION_SECONDS = 1e-4
+
+# Name, text, pattern and whether `re` finishes in reasonable time
+Case = tuple[str, str, str, bool]
+Matcher = Callable[[str], bool]
+
+
+class CompressedNFA(ShiftAndNFA):
+    # The automaton built before normalize, for comparison
+
+    def tokenize(self, p: str) -> list[tuple[str, bool]]:
+        return tokenize(compress_expression(p))
+
+
+def memoized_dp(s: str, p: str) -> bool:
+    # The original recursive solution, kept as the baseline
+    def dp(si, pi) -> bool:
+        if (si, pi) in mem:
+            return mem[si, pi]
+        if pi == P:
+            res = si == S
+            mem[si, pi] = res
+            return res
+        head_matches = si < S and p[pi] in {s[si], "."}
+        if pi + 1 < P and p[pi + 1] == "*":
+            res = head_matches and dp(si + 1, pi) or dp(si, pi + 2)
+        else:
+            res = head_matches and dp(si + 1, pi + 1)
+        mem[si, pi] = res
+        return res
+
+    S = len(s)
+    p = compress_expression(p)
+    P = len(p)
+    mem: dict[tuple[int, int], bool] = {}
+    return dp(0, 0)
+
+
+def sample(p: str, rng: random.Random) -> str:
+    # A random text matching `p`
+    chars = []
+    for char, starred in tokenize(compress_expression(p)):
+        for _ in range(rng.randint(0, 3) if starred else 1):
+            chars.append(rng.choice("abcimps") if char == "." else char)
+    return "".join(chars)
+
+
+def cases(rng: random.Random, max_length: int) -> list[Case]:
+    result = [("demo", DEMO_TEXT, DEMO_PATTERN, True)]
+
+    # The demo pattern repeated up to the length limits
+    p = (DEMO_PATTERN * (max_length // len(DEMO_PATTERN) + 1))
+    p = p[:max_length].rstrip("*")
+    s = sample(p, rng)[:max_length]
+    result.append(("max length match", s, p, False))
+    result.append(("max length near miss", s[:-1] + "#", p, False))
+
+    for i in range(RANDOM_CASES):
+        p = "".join(
+            rng.choice("abc.") + rng.choice(["", "*"])
+            for _ in range(rng.randint(1, 20)))
+        s = "".join(rng.choice("abc") for _ in range(rng.randint(0, 50)))
+        result.append((f"random {i}", s, p, True))
+
+    half = max_length // 2
+    result += [
+        ("star chain near miss", "a" * max_length, "a*" * half + "b", False),
+        ("star chain", "a" * max_length, "a*" * half, False),
+        ("dot run near miss", "b" * max_length, ".*" * half + "a", False),
+        ("dot run", "b" * max_length, ".*" * half + "b", False),
+        ("near miss suffix", "a" * (max_length - 1) + "c",
+         "a*" * (half - 1) + "b", False),
+    ]
+    for p in REDOS_PATTERNS:
+        for n in (MAX_RE_REDOS_LENGTH, max_length):
+            result.append((f"redos {p} n={n}", "a" * n + "!", p, n
+                           <= MAX_RE_REDOS_LENGTH))
+    return result
+
+
+def engines() -> dict[str, tuple[Callable[[str], Matcher], bool]]:
+    # Name: (function preparing a matcher for a pattern, whether it only
+    # supports plain patterns). Cold engines compile on every call, warm
+    # ones once.
+    result: dict[str, tuple[Callable[[str], Matcher], bool]] = {
+        "memoized dp": (lambda p: lambda s: memoized_dp(s, p), True),
+        "iterative dp": (lambda p: lambda s: is_match(s, p), True),
+    }
+    for engine in ENGINES:
+        result[f"{engine} (cold)"] = (
+            lambda p, engine=engine: lambda s: Pattern(p, engine).fullmatch(s),
+            False)
+        result[f"{engine} (warm)"] = (
+            lambda p, engine=engine: Pattern(p, engine).fullmatch, False)
+    result["re.fullmatch"] = (
+        lambda p: lambda s: re.fullmatch(p, s) is not None, False)
+    return result
+
+
+def time_call(f: Callable[[], object]) -> float:
+    number, total = timeit.Timer(f).autorange()
+    return total / number
+
+
+def normalization(rng: random.Random) -> None:
+    # Automaton sizes with left-only compression and with normalize, and
+    # the time for each engine to match texts drawn from the pattern
+    print(f"{'pattern':<24} {'form':<10} {'tokens':>6} {'dfa states':>10} "
+          f"{'dfa':>10} {'bitparallel':>12}")
+    for p in NORMALIZATION_PATTERNS:
+        texts = [sample(p, rng) for _ in range(100)]
+        for form, nfa_type in (("compressed", CompressedNFA), ("normalized",
+                                                               ShiftAndNFA)):
+            patterns = []
+            timings = []
+            for engine in ENGINES:
+                pattern = Pattern(p, engine)
+                pattern.nfa = nfa_type(p)
+                pattern.init_dfa()
+                patterns.append(pattern)
+                timings.append(
+                    time_call(
+                        lambda: [pattern.fullmatch(text) for text in texts]))
+            print(f"{p[:24]:<24} {form:<10} {pattern.nfa.size:>6} "
+                  f"{len(patterns[0].state_sets):>10} "
+                  f"{timings[0] * 1e3:>8.3f}ms "
+                  f"{timings[1] * 1e3:>10.3f}ms")
+        print(f"{'':<24} -> {normalize(p)[:40]}")
+
+
+def peak_memory(f: Callable[[], object]) -> int:
+    # Peak bytes allocated during one call
+    tracemalloc.start()
+    try:
+        f()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(rng: random.Random, max_length: int) -> list[dict]:
+    records = []
+    print(f"{'case':<28} {'|s|':>5} {'|p|':>5}  {'engine':<18} "
+          f"{'time':>10} {'peak memory':>12}")
+    for name, s, p, re_safe in cases(rng, max_length):
+        expected = None
+        for engine, (prepare, plain_only) in engines().items():
+            if plain_only and is_extended(p):
+                continue
+            if (engine == "re.fullmatch" and not re_safe
+                    and (len(p) > MAX_RE_PATTERN_LENGTH or is_extended(p))):
+                continue
+            match = prepare(p)
+            result = match(s)  # Also warms up the warm engines
+            if expected is None:
+                expected = result
+            assert result == expected, (name, engine)
+            seconds = time_call(lambda: match(s))
+            peak = peak_memory(lambda: match(s))
+            records.append({
+                "case": name,
+                "text_length": len(s),
+                "pattern_length": len(p),
+                "engine": engine,
+                "result": result,
+                "seconds": seconds,
+                "peak_bytes": peak,
+            })
+            print(f"{name[:28]:<28} {len(s):>5} {len(p):>5}  {engine:<18} "
+                  f"{seconds * 1e3:>8.3f}ms {peak / 1024:>10.1f}KB")
+    return records
+
+
+def compare(records: list[dict], baseline: dict, threshold: float) -> int:
+    # Prints the results slower than in the baseline report, and returns
+    # how many there are
+    before = {
+        (record["case"], record["engine"]): record["seconds"]
+        for record in baseline["results"]
+    }
+    regressions = 0
+    for record in records:
+        seconds = before.get((record["case"], record["engine"]))
+        if (seconds is not None and record["seconds"] > seconds * threshold
+                and record["seconds"] - seconds > MIN_REGRESSION_SECONDS):
+            regressions += 1
+            print(f"Regression: {record['case']} / {record['engine']}: "
+                  f"{seconds * 1e3:.3f}ms -> {record['seconds'] * 1e3:.3f}ms")
+    return regressions
+
+
+def parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m pregexy.bench",
+                                     description="Benchmark pregexy engines.")
+    parser.add_argument("--json", metavar="PATH", help="write a JSON report")
+    parser.add_argument("--baseline",
+                        metavar="PATH",
+                        help="JSON report to compare timings against")
+    parser.add_argument("--threshold",
+                        type=float,
+                        default=REGRESSION_THRESHOLD,
+                        help="slowdown counted as a regression "
+                        "(default: %(default)s)")
+    parser.add_argument("--quick",
+                        action="store_true",
+                        help=f"cap lengths at {QUICK_MAX_LENGTH}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--normalization",
+                        action="store_true",
+                        help="also compare compressed and normalized "
+                        "automata")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    max_length = QUICK_MAX_LENGTH if args.quick else MAX_LENGTH
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * max_length))
+    rng = random.Random(args.seed)
+    records = run_suite(rng, max_length)
+    if args.normalization:
+        print()
+        normalization(rng)
+
+    if args.json:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "max_length": max_length,
+            "results": records,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(records, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Bit-parallel (Shift-And) simulation of the position automaton.
+
+With state sets kept as int bitmasks, one character updates the whole set
+with a few shifts, masks and one subtraction, whatever the number of live
+states. Skipping over runs of starred tokens uses the carry trick for
+optional characters from Navarro and Raffinot's "Flexible Pattern
+Matching in Strings".
+"""
+
+from .nfa import NFA
+
+
+class ShiftAndNFA(NFA):
+
+    def __init__(self, p: str) -> None:
+        super().__init__(p)
+        tokens = self.tokenize(p)
+        T = len(tokens)
+
+        self.starred = 0
+        # Every maximal run of starred tokens a..b, together with the token
+        # b + 1 after it, forms a block that a state set is closed over
+        self.block_starts = 0  # Bit a of every block
+        self.block_ends = 0  # Bit b + 1 of every block
+        self.block_bits = 0  # Bits a + 1..b + 1 of every block
+        i = 0
+        while i < T:
+            if not tokens[i][1]:
+                i += 1
+                continue
+            start = i
+            while i < T and tokens[i][1]:
+                self.starred |= 1 << i
+                i += 1
+            self.block_starts |= 1 << start
+            self.block_ends |= 1 << i
+            self.block_bits |= (1 << (i + 1)) - (1 << (start + 1))
+
+    def closure(self, states: int) -> int:
+        # Within each block, sets every bit above the lowest set one
+        with_ends = states | self.block_ends
+        return states | (self.block_bits &
+                         (~(with_ends - self.block_starts) ^ with_ends))
+
+    def step(self, states: int, char: str) -> int:
+        active = states & self.char_mask(char)
+        # Unstarred tokens advance, starred ones may match again
+        return self.closure(((active & ~self.starred) << 1)
+                            | (active & self.starred))
+
+    def run(self, states: int, s: str, start: int = 0) -> int:
+        # `step` over s[start:] with everything held in locals
+        literal_masks = self.literal_masks
+        dot_mask = self.dot_mask
+        starred = self.starred
+        unstarred = ~starred
+        block_starts = self.block_starts
+        block_ends = self.block_ends
+        block_bits = self.block_bits
+        for i in range(start, len(s)):
+            active = states & (literal_masks.get(s[i], 0) | dot_mask)
+            states = ((active & unstarred) << 1) | (active & starred)
+            with_ends = states | block_ends
+            states |= block_bits & (~(with_ends - block_starts) ^ with_ends)
+            if not states:
+                break
+        return states
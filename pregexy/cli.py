@@ -0,0 +1,224 @@
+"""
+grep-style command line front end: `python -m pregexy PATTERN FILES...`
+
+Files are cut into chunks of whole lines, and the chunks are matched by a
+pool of worker processes that each compile the pattern once. Results come
+back in input order, so the output does not depend on scheduling.
+"""
+
+import argparse
+import concurrent.futures
+import os
+import sys
+import time
+from typing import Iterator, Optional
+
+from .glushkov import is_extended
+from .pattern import Pattern, compile
+
+CHUNK_SIZE = 1 << 24
+# Bytes read past a chunk boundary at a time while looking for a newline
+BOUNDARY_SCAN_SIZE = 1 << 16
+
+Job = tuple[str, int, int]  # Path, start and end byte offsets
+# Matching lines as (line number within the chunk, text), number of
+# matching lines, lines and bytes in the chunk
+Result = tuple[list[tuple[int, str]], int, int, int]
+
+matcher: Optional[Pattern] = None
+count_only = False
+
+
+def line_pattern(pattern: str, line_regexp: bool) -> Pattern:
+    # Without -x, a line matches when the pattern occurs anywhere in it
+    if line_regexp:
+        return compile(pattern)
+    elif is_extended(pattern):
+        return compile(f".*({pattern}).*")
+    return compile(f".*{pattern}.*")
+
+
+def init_worker(pattern: str, line_regexp: bool, count: bool) -> None:
+    global matcher, count_only
+    matcher = line_pattern(pattern, line_regexp)
+    count_only = count
+
+
+def match_chunk(job: Job) -> Result:
+    path, start, end = job
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    lines = data.decode("utf-8", errors="replace").split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    fullmatch = matcher.fullmatch
+    matches = []
+    count = 0
+    for i, line in enumerate(lines):
+        if fullmatch(line):
+            count += 1
+            if not count_only:
+                matches.append((i + 1, line))
+    return matches, count, len(lines), len(data)
+
+
+def chunk_file(path: str, chunk_size: int) -> Iterator[Job]:
+    # Byte ranges of about `chunk_size` each, cut after a newline
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                f.seek(end)
+                while True:
+                    window = f.read(BOUNDARY_SCAN_SIZE)
+                    newline = window.find(b"\n")
+                    if newline >= 0:
+                        end += newline + 1
+                        break
+                    end += len(window)
+                    if len(window) < BOUNDARY_SCAN_SIZE:
+                        break
+            yield path, start, end
+            start = end
+    if size == 0:
+        yield path, 0, 0
+
+
+def expand(paths: list[str], recursive: bool) -> list[str]:
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+        elif not recursive:
+            raise IsADirectoryError(f"{path}: Is a directory")
+        else:
+            for root, directories, names in os.walk(path):
+                directories.sort()
+                files += [os.path.join(root, name) for name in sorted(names)]
+    return files
+
+
+def plural(count: int, noun: str, plural_noun: Optional[str] = None) -> str:
+    if count == 1:
+        return f"{count} {noun}"
+    return f"{count} {plural_noun or noun + 's'}"
+
+
+def parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m pregexy",
+        description="Print lines matching a pregexy pattern.")
+    parser.add_argument("pattern")
+    parser.add_argument("files", nargs="+", metavar="FILE")
+    parser.add_argument("-x",
+                        "--line-regexp",
+                        action="store_true",
+                        help="match whole lines only")
+    parser.add_argument("-c",
+                        "--count",
+                        action="store_true",
+                        help="print only a count of matching lines per file")
+    parser.add_argument("-n",
+                        "--line-number",
+                        action="store_true",
+                        help="prefix lines with their line number")
+    parser.add_argument("-r",
+                        "--recursive",
+                        action="store_true",
+                        help="search the files under directories")
+    parser.add_argument("-j",
+                        "--jobs",
+                        type=int,
+                        default=os.cpu_count() or 1,
+                        help="worker processes (default: one per core)")
+    parser.add_argument("--chunk-size",
+                        type=int,
+                        default=CHUNK_SIZE,
+                        help="bytes per unit of work (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        # Reports a bad pattern before any worker starts
+        compile(args.pattern)
+        files = expand(args.files, args.recursive)
+        # The same path given twice is searched twice, as in grep, so
+        # results are kept per position in `files` rather than per path
+        jobs = []
+        job_files = []
+        for index, path in enumerate(files):
+            for job in chunk_file(path, max(args.chunk_size, 1)):
+                jobs.append(job)
+                job_files.append(index)
+    except (ValueError, OSError) as e:
+        print(f"pregexy: {e}", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    initargs = (args.pattern, args.line_regexp, args.count)
+    workers = min(args.jobs, len(jobs))
+    if workers > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=init_worker, initargs=initargs)
+        results = executor.map(match_chunk, jobs)
+    else:
+        executor = None
+        workers = 1
+        init_worker(*initargs)
+        results = map(match_chunk, jobs)
+
+    # As in grep, names are printed for several paths or a directory, even
+    # one holding a single file
+    with_filename = len(args.files) > 1 or any(
+        os.path.isdir(path) for path in args.files)
+    counts = [0] * len(files)
+    line_offsets = [0] * len(files)
+    total_lines = 0
+    total_bytes = 0
+    try:
+        for index, (matches, count, lines, size) in zip(job_files, results):
+            prefix = f"{files[index]}:" if with_filename else ""
+            for line_number, line in matches:
+                if args.line_number:
+                    line_number += line_offsets[index]
+                    print(f"{prefix}{line_number}:{line}")
+                else:
+                    print(f"{prefix}{line}")
+            counts[index] += count
+            line_offsets[index] += lines
+            total_lines += lines
+            total_bytes += size
+
+        if args.count:
+            for path, count in zip(files, counts):
+                print(f"{path}:{count}" if with_filename else count)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader went away, e.g. `| head`; drop what is left unwritten
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    except Exception as e:
+        # Raised by a worker, e.g. for a file removed after it was listed
+        print(f"pregexy: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    seconds = time.perf_counter() - started
+    matched = sum(counts)
+    print(
+        f"{plural(matched, 'matching line')} of {total_lines} in "
+        f"{plural(len(files), 'file')} ({total_bytes / 1e6:.1f} MB) in "
+        f"{seconds:.3f}s, {plural(len(jobs), 'chunk')} on "
+        f"{plural(workers, 'process', 'processes')}",
+        file=sys.stderr)
+    return 0 if matched else 1
@@ -0,0 +1,283 @@
+"""
+Extended pregexy syntax on a Glushkov automaton.
+
+Besides literals, `.` and `*`, extended patterns may use `+`, `?`, classes
+like `[a-z]` or `[^0-9]`, alternation `|` and groups `(...)`, and `\\` to
+escape any of these. A pattern is extended as soon as it contains one of
+`+?[]()|\\`; others keep the plain syntax where these are literals.
+
+The Glushkov automaton has one state per char or class in the pattern,
+just like the plain position automaton, so matching stays linear in the
+text: each character costs one step over a state set, and no choice is
+ever revisited. Steps look the follow sets up eight states at a time from
+tables built on first use.
+"""
+
+from typing import Optional
+
+from .nfa import NFA
+from .pregexy import DOT, STAR, normalize, tokenize
+
+EXTENDED = set("+?[]()|\\")
+PLUS = "+"
+OPTIONAL = "?"
+# Class ranges expanded into more chars than this make the alphabet
+# unknown, e.g. for batch matching
+MAX_ALPHABET = 1024
+# Chars whose masks are cached; text with more distinct chars than this
+# has the rest recomputed on every step rather than growing the cache
+MAX_CHAR_MASKS = 4096
+
+# Parsed patterns are nested tuples:
+#   ("char", c), ("any",), ("class", ((lo, hi), ...), negated),
+#   ("cat", [node, ...]), ("alt", [node, ...]),
+#   ("star", node), ("plus", node), ("optional", node)
+Node = tuple
+REPEATS = {STAR: "star", PLUS: "plus", OPTIONAL: "optional"}
+
+
+def is_extended(p: str) -> bool:
+    return any(char in EXTENDED for char in p)
+
+
+def plain_tree(p: str) -> Node:
+    # Tree of a pattern in the plain syntax, where only `.` and `*` are
+    # special, with the same tokens as the plain automata
+    items = []
+    for char, starred in tokenize(normalize(p)):
+        node = ("any", ) if char == DOT else ("char", char)
+        items.append(("star", node) if starred else node)
+    return ("cat", items)
+
+
+def parse(p: str) -> Node:
+    # Each pattern keeps its own syntax, whatever it is combined with
+    return Parser(p).parse() if is_extended(p) else plain_tree(p)
+
+
+class Parser:
+
+    def __init__(self, p: str) -> None:
+        self.p = p
+        self.i = 0
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"{message} at position {self.i}: {self.p!r}")
+
+    def peek(self) -> Optional[str]:
+        return self.p[self.i] if self.i < len(self.p) else None
+
+    def parse(self) -> Node:
+        node = self.alternation()
+        if self.i < len(self.p):
+            raise self.error("Unbalanced ')'")
+        return node
+
+    def alternation(self) -> Node:
+        branches = [self.concatenation()]
+        while self.peek() == "|":
+            self.i += 1
+            branches.append(self.concatenation())
+        return branches[0] if len(branches) == 1 else ("alt", branches)
+
+    def concatenation(self) -> Node:
+        items = []
+        while self.peek() not in (None, "|", ")"):
+            items.append(self.repetition())
+        return ("cat", items)
+
+    def repetition(self) -> Node:
+        node = self.atom()
+        while self.peek() in REPEATS:
+            node = (REPEATS[self.p[self.i]], node)
+            self.i += 1
+        return node
+
+    def atom(self) -> Node:
+        char = self.p[self.i]
+        if char in REPEATS:
+            raise self.error("Nothing to repeat")
+        self.i += 1
+        if char == "(":
+            node = self.alternation()
+            if self.peek() != ")":
+                raise self.error("Missing ')'")
+            self.i += 1
+            return node
+        elif char == "[":
+            return self.char_class()
+        elif char == DOT:
+            return ("any", )
+        elif char == "\\":
+            return ("char", self.escaped())
+        return ("char", char)
+
+    def escaped(self) -> str:
+        if self.i >= len(self.p):
+            raise self.error("Dangling '\\'")
+        self.i += 1
+        return self.p[self.i - 1]
+
+    def class_char(self) -> str:
+        if self.i >= len(self.p):
+            raise self.error("Missing ']'")
+        char = self.p[self.i]
+        self.i += 1
+        return self.escaped() if char == "\\" else char
+
+    def char_class(self) -> Node:
+        negated = self.peek() == "^"
+        if negated:
+            self.i += 1
+        ranges = []
+        # `]` right after `[` or `[^` is a literal
+        while not ranges or self.peek() != "]":
+            low = self.class_char()
+            high = low
+            if (self.peek() == "-" and self.i + 1 < len(self.p)
+                    and self.p[self.i + 1] != "]"):
+                self.i += 1
+                high = self.class_char()
+                if high < low:
+                    raise self.error("Bad character range")
+            ranges.append((low, high))
+        self.i += 1
+        return ("class", tuple(ranges), negated)
+
+
+class GlushkovNFA(NFA):
+
+    def __init__(self, p: str) -> None:
+        self.build([Parser(p).parse()])
+
+    def build(self, trees: list[Node]) -> None:
+        # One automaton accepting any of `trees`, each with its own final
+        # bit after the char states
+        self.follow: list[int] = []
+        self.literal_masks: dict[str, int] = {}
+        self.dot_mask = 0
+        self.classes: list[tuple[int, tuple[tuple[str, str], ...], bool]] = []
+        results = [self.visit(tree) for tree in trees]
+
+        P = len(self.follow)
+        self.size = P
+        self.ends = {}
+        self.final = 0
+        self.start = 0
+        for index, (nullable, first, last) in enumerate(results):
+            final = 1 << (P + index)
+            self.ends[P + index] = index
+            self.final |= final
+            self.start |= first | (final if nullable else 0)
+            for position in bits(last):
+                self.follow[position] |= final
+
+        self.char_masks: dict[str, int] = {}
+        self.tables: list[Optional[list[int]]] = [None] * ((P + 7) // 8)
+
+    def add_position(self) -> int:
+        self.follow.append(0)
+        return 1 << (len(self.follow) - 1)
+
+    def visit(self, node: Node) -> tuple[bool, int, int]:
+        # (nullable, first, last) of the states for `node`, with the follow
+        # sets within it filled in
+        kind = node[0]
+        if kind == "char":
+            bit = self.add_position()
+            self.literal_masks[node[1]] = self.literal_masks.get(node[1],
+                                                                 0) | bit
+            return False, bit, bit
+        elif kind == "any":
+            bit = self.add_position()
+            self.dot_mask |= bit
+            return False, bit, bit
+        elif kind == "class":
+            bit = self.add_position()
+            self.classes.append((bit, node[1], node[2]))
+            return False, bit, bit
+        elif kind == "cat":
+            nullable, first, last = True, 0, 0
+            for item in node[1]:
+                item_nullable, item_first, item_last = self.visit(item)
+                for position in bits(last):
+                    self.follow[position] |= item_first
+                if nullable:
+                    first |= item_first
+                last = item_last | (last if item_nullable else 0)
+                nullable = nullable and item_nullable
+            return nullable, first, last
+        elif kind == "alt":
+            nullable, first, last = False, 0, 0
+            for branch in node[1]:
+                branch_nullable, branch_first, branch_last = self.visit(branch)
+                nullable = nullable or branch_nullable
+                first |= branch_first
+                last |= branch_last
+            return nullable, first, last
+        nullable, first, last = self.visit(node[1])
+        if kind in ("star", "plus"):
+            for position in bits(last):
+                self.follow[position] |= first
+        return kind != "plus" or nullable, first, last
+
+    def alphabet(self) -> Optional[list[str]]:
+        chars = set(self.literal_masks)
+        for _, ranges, _ in self.classes:
+            for low, high in ranges:
+                if ord(high) - ord(low) >= MAX_ALPHABET:
+                    return None
+                chars.update(map(chr, range(ord(low), ord(high) + 1)))
+                if len(chars) > MAX_ALPHABET:
+                    return None
+        return list(chars)
+
+    def other_mask(self) -> int:
+        mask = self.dot_mask
+        for bit, _, negated in self.classes:
+            if negated:
+                mask |= bit
+        return mask
+
+    def char_mask(self, char: str) -> int:
+        mask = self.char_masks.get(char)
+        if mask is None:
+            mask = self.literal_masks.get(char, 0) | self.dot_mask
+            for bit, ranges, negated in self.classes:
+                if any(low <= char <= high for low, high in ranges) != negated:
+                    mask |= bit
+            if len(self.char_masks) < MAX_CHAR_MASKS:
+                self.char_masks[char] = mask
+        return mask
+
+    def table(self, k: int) -> list[int]:
+        # table[byte]: union of the follow sets of states 8k.. in `byte`
+        table = [0] * 256
+        for byte in range(1, 256):
+            low = byte & -byte
+            position = 8 * k + low.bit_length() - 1
+            table[byte] = table[byte ^ low] | (self.follow[position]
+                                               if position < self.size else 0)
+        self.tables[k] = table
+        return table
+
+    def step(self, states: int, char: str) -> int:
+        active = states & self.char_mask(char)
+        result = 0
+        k = 0
+        while active:
+            byte = active & 0xFF
+            if byte:
+                result |= (self.tables[k] or self.table(k))[byte]
+            active >>= 8
+            k += 1
+        return result
+
+
+def bits(mask: int) -> list[int]:
+    positions = []
+    while mask:
+        low = mask & -mask
+        positions.append(low.bit_length() - 1)
+        mask ^= low
+    return positions
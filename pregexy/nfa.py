@@ -0,0 +1,87 @@
+"""
+Position automaton for pregexy patterns.
+
+A state set is an int bitmask: bit i means pattern token i may match the
+next character, and bit `final` that the pattern may end here.
+"""
+
+from .pregexy import DOT, normalize, tokenize
+
+
+class NFA:
+
+    def __init__(self, p: str) -> None:
+        tokens = self.tokenize(p)
+        T = len(tokens)
+        self.size = T
+        self.final = 1 << T
+        # Final bit of every pattern, and the pattern's index
+        self.ends = {T: 0}
+
+        # closures[i]: tokens reachable from token i by skipping starred ones
+        closures = [0] * (T + 1)
+        closures[T] = self.final
+        for i in range(T - 1, -1, -1):
+            closures[i] = 1 << i
+            if tokens[i][1]:
+                closures[i] |= closures[i + 1]
+
+        # follow[i]: state set after token i matched a character
+        self.follow = [
+            closures[i] if starred else closures[i + 1]
+            for i, (_, starred) in enumerate(tokens)
+        ]
+        self.start = closures[0]
+
+        self.dot_mask = 0
+        self.literal_masks: dict[str, int] = {}
+        for i, (char, _) in enumerate(tokens):
+            if char == DOT:
+                self.dot_mask |= 1 << i
+            else:
+                self.literal_masks[char] = self.literal_masks.get(char,
+                                                                  0) | 1 << i
+
+    def tokenize(self, p: str) -> list[tuple[str, bool]]:
+        return tokenize(normalize(p))
+
+    def alphabet(self) -> list[str]:
+        # Chars the pattern tells apart; all others match like one another
+        return list(self.literal_masks)
+
+    def other_mask(self) -> int:
+        # Tokens that match chars outside the alphabet
+        return self.dot_mask
+
+    def char_mask(self, char: str) -> int:
+        # Tokens that match `char`
+        return self.literal_masks.get(char, 0) | self.dot_mask
+
+    def step(self, states: int, char: str) -> int:
+        active = states & self.char_mask(char)
+        result = 0
+        while active:
+            low = active & -active
+            result |= self.follow[low.bit_length() - 1]
+            active ^= low
+        return result
+
+    def run(self, states: int, s: str, start: int = 0) -> int:
+        for i in range(start, len(s)):
+            states = self.step(states, s[i])
+            if not states:
+                break
+        return states
+
+    def accepts(self, states: int) -> bool:
+        return bool(states & self.final)
+
+    def matches(self, states: int) -> tuple[int, ...]:
+        # Indices of the patterns accepting in `states`, in order
+        states &= self.final
+        result = []
+        while states:
+            low = states & -states
+            result.append(self.ends[low.bit_length() - 1])
+            states ^= low
+        return tuple(result)
@@ -0,0 +1,131 @@
+"""
+Compiled pregexy patterns.
+
+A pattern is compiled once into an NFA, the Shift-And position automaton
+for plain patterns or the Glushkov automaton for extended ones (see
+glushkov.py), and matched by one of two engines:
+
+- "dfa": the DFA states reached while matching are built lazily from the
+  NFA and memoized, so matching costs one dict lookup per character once
+  the states involved are known.
+- "bitparallel": the NFA is simulated directly with bit-parallel steps,
+  which needs no DFA tables at all.
+"""
+
+import functools
+import threading
+from typing import Iterator, Optional
+
+from . import scan
+from .bitparallel import ShiftAndNFA
+from .glushkov import GlushkovNFA, is_extended
+
+ENGINES = ("dfa", "bitparallel")
+# Patterns with more tokens than this use the bit-parallel engine. Their
+# DFAs have many states that are rarely reused, while Shift-And steps stay
+# cheap (see bench.py).
+BITPARALLEL_MIN_TOKENS = 64
+# Cap on memoized DFA states per pattern; past it the remaining characters
+# are matched by simulating the NFA directly
+MAX_DFA_STATES = 10000
+COMPILE_CACHE_SIZE = 256
+
+DEAD = 0  # DFA state with no live NFA states
+
+
+class Pattern:
+
+    def __init__(self, pattern: str, engine: Optional[str] = None) -> None:
+        self.pattern = pattern
+        self.nfa = (GlushkovNFA(pattern)
+                    if is_extended(pattern) else ShiftAndNFA(pattern))
+        if engine is None:
+            engine = ("bitparallel"
+                      if self.nfa.size > BITPARALLEL_MIN_TOKENS else "dfa")
+        elif engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine!r}")
+        self.engine = engine
+        self.init_dfa()
+
+    def __repr__(self) -> str:
+        return f"pregexy.compile({self.pattern!r}, engine={self.engine!r})"
+
+    def init_dfa(self) -> None:
+        self.state_ids: dict[int, int] = {}
+        self.state_sets: list[int] = []
+        self.transitions: list[dict[str, int]] = []
+        self.accepting: list[bool] = []
+        self.lock = threading.Lock()
+        self.add_state(0)
+        self.start = self.add_state(self.nfa.start)
+
+    def add_state(self, states: int) -> int:
+        state = self.state_ids.get(states)
+        if state is None:
+            state = len(self.state_sets)
+            self.state_sets.append(states)
+            self.transitions.append({})
+            self.accepting.append(self.nfa.accepts(states))
+            # Published last so concurrent readers never see a partial state
+            self.state_ids[states] = state
+        return state
+
+    def add_transition(self, state: int, char: str) -> int:
+        with self.lock:
+            next_states = self.nfa.step(self.state_sets[state], char)
+            if (next_states not in self.state_ids
+                    and len(self.state_sets) >= MAX_DFA_STATES):
+                return -1
+            next_state = self.add_state(next_states)
+            self.transitions[state][char] = next_state
+            return next_state
+
+    def fullmatch(self, s: str) -> bool:
+        if self.engine == "bitparallel":
+            return self.simulate(self.nfa.start, s, 0)
+        transitions = self.transitions
+        state = self.start
+        for i, char in enumerate(s):
+            next_state = transitions[state].get(char)
+            if next_state is None:
+                next_state = self.add_transition(state, char)
+                if next_state < 0:
+                    return self.simulate(self.state_sets[state], s, i)
+            if next_state == DEAD:
+                return False
+            state = next_state
+        return self.accepting[state]
+
+    def simulate(self, states: int, s: str, start: int) -> bool:
+        return self.nfa.accepts(self.nfa.run(states, s, start))
+
+    def finditer(self, s: str, pos: int = 0) -> Iterator[tuple[int, int]]:
+        # Spans of the non-overlapping leftmost-longest matches
+        return scan.finditer(self.nfa, s, pos)
+
+    def search(self, s: str, pos: int = 0) -> Optional[tuple[int, int]]:
+        return next(self.finditer(s, pos), None)
+
+    def findall(self, s: str, pos: int = 0) -> list[str]:
+        return [s[start:end] for start, end in self.finditer(s, pos)]
+
+
+@functools.lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def compile(pattern: str, engine: Optional[str] = None) -> Pattern:
+    return Pattern(pattern, engine)
+
+
+def is_match(s: str, p: str) -> bool:
+    return compile(p).fullmatch(s)
+
+
+def search(s: str, p: str) -> Optional[tuple[int, int]]:
+    return compile(p).search(s)
+
+
+def finditer(s: str, p: str) -> Iterator[tuple[int, int]]:
+    return compile(p).finditer(s)
+
+
+def findall(s: str, p: str) -> list[str]:
+    return compile(p).findall(s)
@@ -0,0 +1,111 @@
+"""
+Matching one string against many pregexy patterns in a single scan.
+
+All patterns are laid out side by side in one Shift-And NFA, each followed
+by a position that never matches and so marks where that pattern ends. A
+lazy DFA over this union automaton then reads every character once, and
+each DFA state remembers which patterns it accepts, so the cost per
+character does not grow with the number of patterns once the states
+involved are known.
+"""
+
+from typing import Iterable, Optional
+
+from .bitparallel import ShiftAndNFA
+from .glushkov import GlushkovNFA, is_extended, parse
+from .pattern import DEAD, ENGINES, Pattern
+
+END = ""  # Token char no character equals
+
+
+class UnionNFA(ShiftAndNFA):
+
+    def __init__(self, patterns: list[str]) -> None:
+        super().__init__(patterns)
+        self.literal_masks.pop(END, None)
+        # Bit of every END position, and the pattern it ends
+        self.ends: dict[int, int] = {}
+        starts = 0
+        position = 0
+        for index, p in enumerate(patterns):
+            starts |= 1 << position
+            position += len(super().tokenize(p))
+            self.ends[position] = index
+            position += 1
+        self.final = sum(1 << position for position in self.ends)
+        self.start = self.closure(starts)
+
+    def tokenize(self, patterns: list[str]) -> list[tuple[str, bool]]:
+        tokens = []
+        for p in patterns:
+            tokens += super().tokenize(p)
+            tokens.append((END, False))
+        return tokens
+
+
+class ExtendedUnionNFA(GlushkovNFA):
+    # Glushkov automata of the patterns side by side, each with its own
+    # final bit. Plain patterns keep the plain syntax.
+
+    def __init__(self, patterns: list[str]) -> None:
+        self.build([parse(p) for p in patterns])
+
+
+class PatternSet(Pattern):
+    """
+    A compiled set of patterns.
+
+    `match(s)` returns the indices of every pattern that fully matches s.
+    """
+
+    def __init__(self,
+                 patterns: Iterable[str],
+                 engine: Optional[str] = None) -> None:
+        self.patterns = list(patterns)
+        # What `Pattern.pattern` holds for a single pattern
+        self.pattern = self.patterns
+        if any(map(is_extended, self.patterns)):
+            self.nfa = ExtendedUnionNFA(self.patterns)
+        else:
+            self.nfa = UnionNFA(self.patterns)
+        if engine is None:
+            engine = "dfa"
+        elif engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine!r}")
+        self.engine = engine
+        self.state_matches: list[tuple[int, ...]] = []
+        self.init_dfa()
+
+    def __repr__(self) -> str:
+        return (f"pregexy.PatternSet({self.patterns!r}, "
+                f"engine={self.engine!r})")
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def add_state(self, states: int) -> int:
+        if states not in self.state_ids:
+            self.state_matches.append(self.nfa.matches(states))
+        return super().add_state(states)
+
+    def match(self, s: str) -> list[int]:
+        if self.engine == "bitparallel":
+            return list(self.nfa.matches(self.nfa.run(self.nfa.start, s)))
+        transitions = self.transitions
+        state = self.start
+        for i, char in enumerate(s):
+            next_state = transitions[state].get(char)
+            if next_state is None:
+                next_state = self.add_transition(state, char)
+                if next_state < 0:
+                    return list(
+                        self.nfa.matches(
+                            self.nfa.run(self.state_sets[state], s, i)))
+            if next_state == DEAD:
+                return []
+            state = next_state
+        return list(self.state_matches[state])
+
+    def fullmatch(self, s: str) -> bool:
+        # Whether any of the patterns matches
+        return bool(self.match(s))
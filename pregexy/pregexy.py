@@ -3,7 +3,7 @@ LC0010. Regular Expression Matching
 https://leetcode.com/problems/regular-expression-matching/description/
 
 TC: O(TP)
-SC: O(TP)
+SC: O(P)
 """
 
 DOT = "."
@@ -11,36 +11,99 @@ STAR = "*"
 
 
 def is_match(s: str, p: str) -> bool:
+    S = len(s)
+    # Last token first
+    tokens = tokenize(normalize(p))
+    tokens.reverse()
+    T = len(tokens)
 
-    def dp(si, pi) -> bool:
-        if (si, pi) in mem:
-            return mem[si, pi]
+    # Bottom-up version of
+    #   dp(si, ti) = s[si:] matches tokens[ti:]
+    # Row si only depends on row si + 1, so two rows are kept and swapped.
+    # `next_row[ti]` is dp(si + 1, ti) while `row` is filled in for si.
+    next_row = bytearray(T + 1)
+    row = bytearray(T + 1)
+    for si in range(S, -1, -1):
+        row[T] = si == S
+        head = s[si] if si < S else None
+        ti = T
+        for char, starred in tokens:
+            ti -= 1
+            head_matches = char == head or char == DOT and head is not None
+            if starred:
+                # f s a*::pattern = s == a::tail && f tail a*::pattern ||
+                #                   f s pattern
+                row[ti] = head_matches and next_row[ti] or row[ti + 1]
+            else:
+                # f s a::pattern = s == a::tail && f tail pattern
+                row[ti] = head_matches and next_row[ti + 1]
+        row, next_row = next_row, row
 
-        if pi == P:
-            res = si == S
-            mem[si, pi] = res
-            return res
+    return bool(next_row[0])
 
-        # f s a*::pattern = s == a::tail && f tail a*::pattern ||
-        #                   f s pattern
-        head_matches = si < S and p[pi] in {s[si], DOT}
-        if pi + 1 < P and p[pi + 1] == STAR:
-            res = head_matches and dp(si + 1, pi) or dp(si, pi + 2)
-        else:
-            # f s a::pattern = s == a::tail && f tail pattern
-            res = head_matches and dp(si + 1, pi + 1)
-        mem[si, pi] = res
-        return res
 
-    S = len(s)
-    p = compress_expression(p)
-    P = len(p)
-    mem = {}
+def tokenize(p: str) -> list[tuple[str, bool]]:
+    # (char, starred) of every pattern token
+    tokens = []
+    pi = 0
+    while pi < len(p):
+        starred = pi + 1 < len(p) and p[pi + 1] == STAR
+        tokens.append((p[pi], starred))
+        pi += 2 if starred else 1
+    return tokens
+
 
-    return dp(0, 0)
+def normalize(p: str) -> str:
+    # Equivalent pattern with redundant stars rewritten away:
+    # - A run of starred tokens containing `.*` is just `.*`, and equal
+    #   neighbours within a run merge e.g., `a*.*b*` -> `.*`, `a*a*` -> `a*`
+    # - Neighbours with the same char put the starred one last e.g.,
+    #   `a*aa*` -> `aa*`, `.*.` -> `..*`
+    # Rewriting one kind can enable the other, so both repeat until stable.
+    tokens = tokenize(p)
+    while True:
+        result = shift_stars_right(merge_star_runs(tokens))
+        if result == tokens:
+            return "".join(char + STAR if starred else char
+                           for char, starred in tokens)
+        tokens = result
+
+
+def merge_star_runs(tokens: list[tuple[str, bool]]) -> list[tuple[str, bool]]:
+    result = []
+    i = 0
+    while i < len(tokens):
+        if not tokens[i][1]:
+            result.append(tokens[i])
+            i += 1
+            continue
+        run = []
+        while i < len(tokens) and tokens[i][1]:
+            if not run or run[-1] != tokens[i]:
+                run.append(tokens[i])
+            i += 1
+        result += [(DOT, True)] if (DOT, True) in run else run
+    return result
+
+
+def shift_stars_right(
+        tokens: list[tuple[str, bool]]) -> list[tuple[str, bool]]:
+    result = []
+    i = 0
+    while i < len(tokens):
+        char = tokens[i][0]
+        group = []
+        while i < len(tokens) and tokens[i][0] == char:
+            group.append(tokens[i])
+            i += 1
+        result += [(char, False) for _, starred in group if not starred]
+        if any(starred for _, starred in group):
+            result.append((char, True))
+    return result
 
 
-# TODO Compress to right either
+# Merges starred neighbours to the left only, kept for comparison with
+# normalize
 def compress_expression(p) -> str:
     res = ""
     prev = ""
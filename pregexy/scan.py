@@ -0,0 +1,94 @@
+"""
+Unanchored leftmost-longest matching in one left-to-right pass.
+
+A thread is started at every offset and advanced with NFA steps,
+keeping the offset it started at. Threads at the same NFA position have
+the same future, so each position belongs only to the thread that
+started first; the others could only ever produce overlapping matches.
+That leaves at most one thread per pattern token, so every character
+costs the same however long the text is.
+
+Accepting threads record tentative matches. A match is reported once no
+live thread started at or before it, since then nothing can still start
+further left or end further right.
+"""
+
+from typing import Iterator
+
+from .nfa import NFA
+
+
+def accept(tentative: list[list[int]], start: int, end: int) -> None:
+    # Record a match of s[start:end], replacing the tentative matches it
+    # overlaps or extends
+    for j, (b, _) in enumerate(tentative):
+        if b == start:
+            tentative[j][1] = end
+            del tentative[j + 1:]
+            return
+        if b > start:
+            del tentative[j:]
+            break
+    tentative.append([start, end])
+
+
+def finditer(nfa: NFA, s: str, pos: int = 0) -> Iterator[tuple[int, int]]:
+    # Spans of the non-overlapping leftmost-longest matches in s[pos:]
+    start_states = nfa.start & ~nfa.final
+    start_accepts = nfa.accepts(nfa.start)
+    # With a single possible first character, idle stretches are skipped
+    alphabet = nfa.alphabet()
+    first_chars = ({
+        char
+        for char in alphabet if start_states & nfa.char_mask(char)
+    } if alphabet is not None and not start_states & nfa.other_mask()
+                   and not start_accepts else set())
+    skip_to = next(iter(first_chars)) if len(first_chars) == 1 else None
+
+    threads: list[list[int]] = []  # [start, states] by start
+    tentative: list[list[int]] = []  # [start, end] of pending matches
+    n = len(s)
+    i = pos
+    while True:
+        # Threads have read s[start:i]. Only the first to accept matters,
+        # later ones started inside its match.
+        for k, (start, states) in enumerate(threads):
+            if states & nfa.final:
+                accept(tentative, start, i)
+                del threads[k + 1:]
+                break
+
+        if not threads and skip_to is not None and i < n and s[i] != skip_to:
+            for b, e in tentative:
+                yield b, e
+            tentative.clear()
+            i = s.find(skip_to, i)
+            if i < 0:
+                return
+
+        owned = 0
+        for _, states in threads:
+            owned |= states
+        if start_states & ~owned:
+            threads.append([i, start_states & ~owned])
+        if start_accepts:
+            accept(tentative, i, i)
+
+        while tentative and (not threads or threads[0][0] > tentative[0][0]):
+            b, e = tentative.pop(0)
+            yield b, e
+
+        if i == n:
+            for b, e in tentative:
+                yield b, e
+            return
+        char = s[i]
+        owned = 0
+        advanced = []
+        for start, states in threads:
+            states = nfa.step(states, char) & ~owned
+            if states:
+                owned |= states
+                advanced.append([start, states])
+        threads = advanced
+        i += 1
@@ -0,0 +1,102 @@
+"""
+Matching text that arrives in chunks.
+
+A Matcher keeps nothing but the automaton state between chunks, so a
+subject of any size is matched in constant memory. Once the state is dead
+the rest of the input is skipped.
+"""
+
+import codecs
+import mmap
+import os
+
+from .pattern import DEAD, Pattern, compile
+
+CHUNK_SIZE = 1 << 20
+
+
+class Matcher:
+    """
+    Incremental `fullmatch` of one subject against `pattern`.
+
+    Call `feed` with consecutive chunks, then `finish` for the result.
+    """
+
+    def __init__(self,
+                 pattern: str | Pattern,
+                 encoding: str = "utf-8") -> None:
+        if isinstance(pattern, str):
+            pattern = compile(pattern)
+        self.pattern = pattern
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        # DFA state, or -1 once the NFA is simulated directly
+        self.state = -1 if pattern.engine == "bitparallel" else pattern.start
+        self.states = pattern.nfa.start
+
+    @property
+    def dead(self) -> bool:
+        # No continuation can match any more
+        return self.state == DEAD or self.state < 0 and not self.states
+
+    def feed(self, chunk: str) -> None:
+        if self.dead:
+            return
+        pattern = self.pattern
+        if self.state < 0:
+            self.states = pattern.nfa.run(self.states, chunk)
+            return
+        transitions = pattern.transitions
+        state = self.state
+        for i, char in enumerate(chunk):
+            next_state = transitions[state].get(char)
+            if next_state is None:
+                next_state = pattern.add_transition(state, char)
+                if next_state < 0:
+                    # Past the DFA state cap
+                    self.state = -1
+                    self.states = pattern.nfa.run(pattern.state_sets[state],
+                                                  chunk, i)
+                    return
+            state = next_state
+            if state == DEAD:
+                break
+        self.state = state
+
+    def feed_bytes(self, chunk: bytes | memoryview) -> None:
+        # Encoded input; characters split across chunks are carried over
+        if not self.dead:
+            self.feed(self.decoder.decode(chunk))
+
+    def finish(self) -> bool:
+        if self.dead:
+            return False
+        self.feed(self.decoder.decode(b"", final=True))
+        if self.state >= 0:
+            return self.pattern.accepting[self.state]
+        return self.pattern.nfa.accepts(self.states)
+
+
+def match_file(path: str | os.PathLike,
+               pattern: str | Pattern,
+               encoding: str = "utf-8",
+               chunk_size: int = CHUNK_SIZE) -> bool:
+    """
+    Whether the whole contents of the file at `path` match `pattern`.
+
+    The file is memory-mapped and fed to a Matcher in slices of the map,
+    so only one decoded chunk is held in memory at a time.
+    """
+    matcher = Matcher(pattern, encoding)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return matcher.finish()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            view = memoryview(buffer)
+            try:
+                for start in range(0, len(view), chunk_size):
+                    if matcher.dead:
+                        break
+                    matcher.feed_bytes(view[start:start + chunk_size])
+            finally:
+                view.release()
+    return matcher.finish()
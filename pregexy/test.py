@@ -1,4 +1,23 @@
-from pregexy import is_match
+import contextlib
+import io
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+
+from pregexy import (Matcher, PatternSet, compile, finditer, is_match,
+                     match_file, match_many, search)
+from pregexy import cli
+from pregexy.glushkov import MAX_CHAR_MASKS
+from pregexy.pattern import ENGINES
+from pregexy.pregexy import compress_expression
+from pregexy.pregexy import is_match as is_match_dp
+from pregexy.pregexy import normalize, tokenize
 
 
 def test():
@@ -23,8 +42,308 @@ def test():
         "mississippiabbcacbbbbbabcbacaaccbabbacbbbacbcbaacacaaccbaabcbaabcbcbcaccbcaabc",
         "mis*is*ip*.a*a*.*a*.*a*.b*a*a*.*b*c*b*b*.*ac*.*bc*a*.*a*aa*.*b*.c*.*a*"
     ) == True
+    # Inputs at the demo's 1000 + 1000 limits used to exhaust the recursion
+    assert is_match("a" * 1000, "a*b*" * 250) == True
+    assert is_match("ab" * 500, "a*b*" * 250 + "c") == False
+    test_random()
+    test_compile()
+    test_match_many()
+    test_pattern_set()
+    test_finditer()
+    test_normalize()
+    test_extended()
+    test_stream()
+    test_cli()
     print("\n=== Test finished. ===")
 
 
+def test_random():
+    # `.` and `*` mean the same in `re`, which serves as the reference
+    rng = random.Random(10)
+    for _ in range(5000):
+        s = "".join(rng.choice("abc") for _ in range(rng.randint(0, 12)))
+        p = "".join(
+            rng.choice("abc.") + rng.choice(["", "*"])
+            for _ in range(rng.randint(0, 8)))
+        expected = bool(re.fullmatch(p, s))
+        assert is_match(s, p) == expected, (s, p)
+        assert is_match_dp(s, p) == expected, (s, p)
+        for engine in ENGINES:
+            assert compile(p, engine).fullmatch(s) == expected, (s, p, engine)
+
+
+def test_compile():
+    pattern = compile("mis*is*ip*.")
+    assert compile("mis*is*ip*.") is pattern
+    assert pattern.fullmatch("mississippi") == True
+    assert pattern.fullmatch("mississippX") == True
+    assert pattern.fullmatch("mississippi!") == False
+    assert pattern.fullmatch("mississi") == False
+    assert pattern.fullmatch("") == False
+
+
+def test_match_many():
+    rng = random.Random(34)
+    for _ in range(200):
+        strings = [
+            "".join(rng.choice("abcé") for _ in range(rng.randint(0, 10)))
+            for _ in range(50)
+        ]
+        p = "".join(
+            rng.choice("abcé.") + rng.choice(["", "*"])
+            for _ in range(rng.randint(0, 6)))
+        expected = np.array([bool(re.fullmatch(p, s)) for s in strings])
+        for batch in (strings, np.array(strings), pa.array(strings),
+                      pa.chunked_array([strings[:20], strings[20:]])):
+            assert (match_many(p, batch) == expected).all(), (p, batch)
+        assert (match_many(p,
+                           pa.array(strings)[10:30]) == expected[10:30]).all()
+    assert match_many("a.*",
+                      ["ab", None, "ba"]).tolist() == [True, False, False]
+    assert match_many("a*", np.array([], dtype=str)).tolist() == []
+    grid = np.array([["ab", "b"], ["aab", ""]])
+    assert match_many("a*b", grid).tolist() == [[True, True], [True, False]]
+    # Through the per-string fallback too
+    assert match_many("[a-\uffff]*b", grid).tolist() == [[True, True],
+                                                         [True, False]]
+
+
+def test_pattern_set():
+    rng = random.Random(35)
+    for _ in range(1000):
+        patterns = [
+            "".join(
+                rng.choice("abc.") + rng.choice(["", "*"])
+                for _ in range(rng.randint(0, 5)))
+            for _ in range(rng.randint(0, 6))
+        ]
+        s = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+        expected = [i for i, p in enumerate(patterns) if re.fullmatch(p, s)]
+        for engine in ENGINES:
+            assert PatternSet(patterns,
+                              engine).match(s) == expected, (patterns, s)
+    routes = PatternSet(["mis*is*ip*.", ".*", "a*b", ""])
+    assert routes.match("mississippi") == [0, 1]
+    assert routes.match("aab") == [1, 2]
+    assert routes.match("") == [1, 3]
+    assert PatternSet([]).match("a") == []
+
+
+def leftmost_longest(s, p):
+    # Spans found by trying every substring
+    spans = []
+    pos = 0
+    while pos <= len(s):
+        starts = range(pos + 1 if spans and spans[-1] == (pos, pos) else pos,
+                       len(s) + 1)
+        span = next(((start, end) for start in starts
+                     for end in range(len(s), start - 1, -1)
+                     if is_match_dp(s[start:end], p)), None)
+        if span is None:
+            break
+        spans.append(span)
+        pos = span[1]
+    return spans
+
+
+def test_finditer():
+    rng = random.Random(36)
+    for _ in range(3000):
+        s = "".join(rng.choice("abc") for _ in range(rng.randint(0, 10)))
+        p = "".join(
+            rng.choice("abc.") + rng.choice(["", "*"])
+            for _ in range(rng.randint(0, 4)))
+        expected = leftmost_longest(s, p)
+        assert list(finditer(s, p)) == expected, (s, p)
+        assert search(s, p) == (expected[0] if expected else None), (s, p)
+    log = "GET /a 200\nGET /mississippi 404\n" * 1000
+    assert search(log, "mis*is*ip*.") == (16, 27)
+    assert len(list(finditer(log, "4.4"))) == 1000
+    assert compile("a*").findall("baab") == ["", "aa", "", ""]
+
+
+def test_normalize():
+    assert normalize("a*.*a*") == ".*"
+    assert normalize("a*a*a*a*a*a*a*a*a*b") == "a*b"
+    assert normalize("a*aa*") == "aa*"
+    assert normalize(".*.a*") == "..*"
+    assert normalize("b*c*b*") == "b*c*b*"
+    # The normalized pattern matches the same strings in fewer tokens
+    rng = random.Random(37)
+    for _ in range(2000):
+        p = "".join(
+            rng.choice("ab.") + rng.choice(["", "*"])
+            for _ in range(rng.randint(0, 8)))
+        normalized = normalize(p)
+        assert normalize(normalized) == normalized, p
+        assert len(tokenize(normalized)) <= len(
+            tokenize(compress_expression(p))), p
+        for _ in range(20):
+            s = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+            assert bool(re.fullmatch(normalized,
+                                     s)) == bool(re.fullmatch(p,
+                                                              s)), (s, p,
+                                                                    normalized)
+
+
+def random_extended(rng, depth=0):
+    # Quantified groups hold no quantifiers, which keeps `re` from
+    # backtracking exponentially on the reference side
+    quantifier = rng.choice(["", "", "*", "+", "?"])
+    r = rng.random()
+    if depth > 1 or r < 0.5:
+        return rng.choice([
+            "a", "b", ".", "[ab]", "[^a]", "[a-c]", "\\.", "[]a]"
+        ]) + quantifier
+    elif r < 0.75:
+        atoms = [rng.choice("ab.") for _ in range(rng.randint(1, 3))]
+        return "(" + rng.choice(["", "|"]).join(atoms) + ")" + quantifier
+    return ("(" + random_extended(rng, depth + 1) + "|" +
+            random_extended(rng, depth + 1) + ")")
+
+
+def test_extended():
+    rng = random.Random(38)
+    for _ in range(1000):
+        p = "".join(random_extended(rng) for _ in range(rng.randint(1, 3)))
+        strings = [
+            "".join(rng.choice("abc.") for _ in range(rng.randint(0, 8)))
+            for _ in range(10)
+        ]
+        expected = [bool(re.fullmatch(p, s)) for s in strings]
+        for engine in ENGINES:
+            assert [compile(p, engine).fullmatch(s)
+                    for s in strings] == expected, (p, engine)
+        assert match_many(p, strings).tolist() == expected, p
+        assert PatternSet([p, "a+"]).match(strings[0]) == [
+            i for i, q in enumerate([p, "a+"]) if re.fullmatch(q, strings[0])
+        ], p
+        # Plain patterns in the set keep their own syntax
+        plain = "".join(rng.choice("ab.*") for _ in range(rng.randint(0, 4)))
+        assert PatternSet([plain, p]).match(strings[0]) == [
+            i for i, q in enumerate([plain, p])
+            if compile(q).fullmatch(strings[0])
+        ], (plain, p)
+    assert PatternSet(["a**", "b+"]).match("a*") == [0]
+    assert PatternSet(["*a", "b+"]).match("*a") == [0]
+    assert PatternSet(["a", "b"]).pattern == ["a", "b"]
+    assert search("GET /users/42 200", "[0-9]+") == (11, 13)
+    assert compile("[0-9]+").findall("a 12 b 345") == ["12", "345"]
+    assert is_match("a+b", "a\\+b") == True
+    for p in ["(a", "a)", "[a", "a|+", "[b-a]", "a\\"]:
+        try:
+            compile(p)
+        except ValueError:
+            continue
+        raise AssertionError(p)
+    # Exponential for backtracking engines, linear here
+    assert is_match("a" * 100000 + "!", "(a+)+b") == False
+    assert is_match("a" * 100000, "(a|a?)+") == True
+    # Masks of distinct chars are cached only up to a limit
+    pattern = compile("[^a]+")
+    text = "".join(map(chr, range(0x4e00, 0x4e00 + 2 * MAX_CHAR_MASKS)))
+    assert pattern.fullmatch(text) == True
+    assert len(pattern.nfa.char_masks) == MAX_CHAR_MASKS
+
+
+def test_stream():
+    rng = random.Random(39)
+    for _ in range(1000):
+        p = "".join(
+            rng.choice("abé.") + rng.choice(["", "*", "+"])
+            for _ in range(rng.randint(0, 5)))
+        s = "".join(rng.choice("abé") for _ in range(rng.randint(0, 12)))
+        expected = bool(re.fullmatch(p, s))
+        for engine in ENGINES:
+            # Chunks may split the bytes of `é`
+            matcher = Matcher(compile(p, engine))
+            data = s.encode()
+            i = 0
+            while i < len(data):
+                size = rng.randint(1, 3)
+                matcher.feed_bytes(data[i:i + size])
+                i += size
+            assert matcher.finish() == expected, (s, p, engine)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "log")
+        with open(path, "wb") as f:
+            f.write(("mississippi " * 10000 + "é").encode())
+        assert match_file(path, "(mis*is*ip*. )*é", chunk_size=4097) == True
+        assert match_file(path, "mis.*x") == False
+        open(path, "wb").close()
+        assert match_file(path, "a*") == True
+
+
+def run_cli(*argv):
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(
+            io.StringIO()):
+        status = cli.main(list(argv))
+    return status, stdout.getvalue()
+
+
+def test_cli():
+    with tempfile.TemporaryDirectory() as directory:
+        os.mkdir(os.path.join(directory, "old"))
+        logs = {
+            "app.log": ["GET /users 200", "GET /orders 500"] * 300,
+            os.path.join("old", "app.log"): ["POST /users 503", "é"] * 5,
+        }
+        for name, lines in logs.items():
+            with open(os.path.join(directory, name), "w") as f:
+                f.write("\n".join(lines) + "\n")
+        app = os.path.join(directory, "app.log")
+        old = os.path.join(directory, "old", "app.log")
+
+        status, output = run_cli("-n", "5.[03]", app)
+        assert status == 0
+        assert output.splitlines()[:2] == [
+            "2:GET /orders 500", "4:GET /orders 500"
+        ]
+        # Many small chunks over several processes print the same
+        assert run_cli("-n", "5.[03]", app, "-j", "3", "--chunk-size",
+                       "100") == (status, output)
+        assert run_cli("-r", "-c", "5.[03]",
+                       directory) == (0, f"{app}:300\n{old}:5\n")
+        assert run_cli("-x", "-c", "5.[03]", app) == (1, "0\n")
+        assert run_cli("(", app) == (2, "")
+        assert run_cli("5", directory) == (2, "")
+        # Names are printed for a directory even with one file in it
+        assert run_cli("-r", "-c", "5.[03]",
+                       os.path.dirname(old)) == (0, f"{old}:5\n")
+
+        # A path given twice is searched twice
+        twice = os.path.join(directory, "twice")
+        with open(twice, "w") as f:
+            f.write("ab\nxx\nab\n")
+        assert run_cli("-n", "ab", twice, twice, "--chunk-size",
+                       "3") == (0, "".join(f"{twice}:{n}:ab\n"
+                                           for n in (1, 3, 1, 3)))
+        assert run_cli("-c", "ab", twice,
+                       twice) == (0, f"{twice}:2\n{twice}:2\n")
+
+        # A file gone by the time it is read fails the run with status 2
+        chunk_file = cli.chunk_file
+        cli.chunk_file = lambda path, size: [(f"{path}.gone", 0, 1)]
+        try:
+            assert run_cli("5", app) == (2, "")
+        finally:
+            cli.chunk_file = chunk_file
+
+        # A reader that stops early, like `| head -1`, is not an error
+        with open(app, "a") as f:
+            f.write("GET /orders 500\n" * 100000)
+        process = subprocess.Popen(
+            [sys.executable, "-m", "pregexy", "5.[03]", app],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE)
+        assert process.stdout.readline() == b"GET /orders 500\n"
+        process.stdout.close()
+        assert process.wait() == 1
+        assert b"Traceback" not in process.stderr.read()
+        process.stderr.close()
+
+
 if __name__ == "__main__":
     test()
@@ -1,11 +1,22 @@
+import bisect
+import codecs
+import collections
 import io
 import logging
-from contextlib import redirect_stdout
+import math
+import tempfile
+import time
+from array import array
+from typing import IO, TYPE_CHECKING, Iterator, Optional
 
 import streamlit as st
 
-import pregexy
-from pawky import AWKInterpreter
+import metrics
+
+# Each demo imports its engine on first use, so the app starts without
+# loading PLY and the parse tables, or pregexy, up front
+if TYPE_CHECKING:
+    from pawky import AWKInterpreter
 
 # Configure logging
 logging.basicConfig(filename='app.log',
@@ -30,8 +41,162 @@ PROJECT_2 = {
     "https://github.com/lentil32/python-streamlit-demos/blob/main/pregexy/pregexy.py"
 }
 
+METRICS_PAGE = "Metrics"
+
+# Uploaded input is fed to the interpreter in chunks of this many bytes
+UPLOAD_CHUNK_SIZE = 1 << 16
+# How often the progress bar and the output preview are redrawn
+REFRESH_INTERVAL = 0.5  # seconds
+OUTPUT_PREVIEW_LINES = 200
+# Bounds on what a single page of output sends to the browser
+OUTPUT_PAGE_SIZE = 500
+OUTPUT_LINE_LENGTH = 1000
+MAX_SEARCH_RESULTS = 1000
+# Spooled output is indexed and searched in blocks of this many bytes
+OUTPUT_SCAN_CHUNK_SIZE = 1 << 20
+
+
+class OutputStore:
+    """Interpreter output kept on disk with an index of record offsets."""
+
+    def __init__(self, file: IO[bytes], separator: str,
+                 delimiter: str) -> None:
+        self.file = file
+        self.separator = separator.encode()
+        self.delimiter = delimiter
+        self.size = file.seek(0, io.SEEK_END)
+        # Start offset of every record followed by the end of the output
+        self.offsets = array('Q', [0])
+        self.build_index()
+
+    @property
+    def line_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def scan(self, overlap: int) -> Iterator[tuple[int, bytes]]:
+        # Yields (offset, data) blocks where consecutive blocks share
+        # `overlap` bytes, so no match of that length plus one is missed
+        self.file.seek(0)
+        position = 0
+        tail = b""
+        while chunk := self.file.read(OUTPUT_SCAN_CHUNK_SIZE):
+            data = tail + chunk
+            yield position - len(tail), data
+            position += len(chunk)
+            tail = data[len(data) - overlap:] if overlap else b""
+
+    def build_index(self) -> None:
+        if self.separator:
+            step = len(self.separator)
+            for position, data in self.scan(step - 1):
+                index = data.find(self.separator)
+                while index != -1:
+                    end = position + index + step
+                    if end > self.offsets[-1]:
+                        self.offsets.append(end)
+                    index = data.find(self.separator, index + step)
+        if self.offsets[-1] < self.size:
+            self.offsets.append(self.size)
+
+    def lines(self, start: int, stop: int) -> list[str]:
+        start = max(start, 0)
+        stop = min(stop, self.line_count)
+        if start >= stop:
+            return []
+        self.file.seek(self.offsets[start])
+        data = self.file.read(self.offsets[stop] - self.offsets[start])
+        lines = []
+        for i in range(start, stop):
+            begin = self.offsets[i] - self.offsets[start]
+            end = self.offsets[i + 1] - self.offsets[start]
+            if data.endswith(self.separator, begin, end):
+                end -= len(self.separator)
+            # A UTF-8 character is at most 4 bytes
+            end = min(end, begin + OUTPUT_LINE_LENGTH * 4)
+            line = data[begin:end].decode('utf-8', errors='replace')
+            lines.append(line[:OUTPUT_LINE_LENGTH])
+        return lines
+
+    def search(self, query: str, limit: int) -> list[int]:
+        needle = query.encode()
+        matches: list[int] = []
+        for position, data in self.scan(len(needle) - 1):
+            index = data.find(needle)
+            while index != -1 and len(matches) < limit:
+                line = bisect.bisect_right(self.offsets, position + index) - 1
+                if not matches or matches[-1] != line:
+                    matches.append(line)
+                # Resume at the next record since one hit per line suffices
+                index = data.find(needle, self.offsets[line + 1] - position)
+            if len(matches) >= limit:
+                break
+        return matches
+
+    def getvalue(self) -> bytes:
+        self.file.seek(0)
+        return self.file.read()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class StreamingOutput(io.TextIOBase):
+    """Spool interpreter output to a temporary file while showing its tail."""
+
+    def __init__(self, placeholder) -> None:
+        self.placeholder = placeholder
+        self.file = tempfile.TemporaryFile()
+        self.preview: collections.deque[str] = collections.deque(
+            maxlen=OUTPUT_PREVIEW_LINES)
+        self.partial_line = ""
+        self.size = 0
+        self.last_refresh = 0.0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self.size += self.file.write(text.encode())
+        lines = (self.partial_line + text).split('\n')
+        self.partial_line = lines.pop()[-OUTPUT_LINE_LENGTH:]
+        self.preview.extend(line[:OUTPUT_LINE_LENGTH] for line in lines)
+        if time.monotonic() - self.last_refresh >= REFRESH_INTERVAL:
+            self.refresh()
+        return len(text)
+
+    def refresh(self) -> None:
+        self.last_refresh = time.monotonic()
+        lines = list(self.preview)
+        if self.partial_line:
+            lines.append(self.partial_line)
+        self.placeholder.code('\n'.join(lines), language='text')
+
+    def to_store(self, separator: str, delimiter: str) -> OutputStore:
+        self.placeholder.empty()
+        return OutputStore(self.file, separator, delimiter)
+
+
+def read_upload(uploaded_file: IO[bytes], interpreter: "AWKInterpreter",
+                progress) -> Iterator[str]:
+    # Decode incrementally so multi-byte characters may straddle chunks
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    total = max(uploaded_file.size, 1)
+    consumed = 0
+    last_refresh = 0.0
+    while chunk := uploaded_file.read(UPLOAD_CHUNK_SIZE):
+        consumed += len(chunk)
+        if time.monotonic() - last_refresh >= REFRESH_INTERVAL:
+            last_refresh = time.monotonic()
+            progress.progress(consumed / total,
+                              text=f"Read {consumed:,} of {total:,} bytes, "
+                              f"NR = {interpreter.builtins['NR']:,}")
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
 
 def run_pawky():
+    from pawky import AWKInterpreter
+
     st.title(PROJECT_1["title"])
     st.markdown(PROJECT_1["description"], unsafe_allow_html=True)
     st.markdown(f"[GitHub Repository]({PROJECT_1['repository']})")
@@ -62,8 +227,11 @@ BEGIN {
                               height=400)
 
     st.header("Input Data")
-    input_data = st.text_area("Enter input data:",
-                              """\
+    input_source = st.radio("Input source:", ["Text", "Upload file"],
+                            horizontal=True)
+    if input_source == "Text":
+        input_data = st.text_area("Enter input data:",
+                                  """\
 a1,a2,7
 b1,b2,0
 c1,c2,11
@@ -71,15 +239,19 @@ d1,NULL,24
 NILL,e2,1
 f1,null,3
 """,
-                              height=250)
+                                  height=250)
+        uploaded_file = None
+    else:
+        input_data = ""
+        uploaded_file = st.file_uploader("Upload input file:")
 
     if st.button("Run Interpreter"):
         # Input Validation
         if not awk_script.strip():
             st.error("Please enter an AWK script.")
             return
-        if not input_data.strip():
-            st.error("Please enter input data.")
+        if uploaded_file is None and not input_data.strip():
+            st.error("Please enter input data or upload a file.")
             return
 
         max_script_length = 5000
@@ -92,33 +264,123 @@ f1,null,3
             return
         if len(input_data) > max_input_length:
             st.error(
-                f"Input data is too long. Maximum allowed length is {max_input_length} characters."
+                f"Input data is too long. Maximum allowed length is {max_input_length} characters. Upload a file for larger inputs."
             )
             return
 
-        # Capture the output of the interpreter
-        buffer = io.StringIO()
+        timer = metrics.RequestTimer(metrics.registry, "pawky")
+        progress = st.progress(0.0) if uploaded_file is not None else None
+        output = StreamingOutput(st.empty())
         try:
-            with redirect_stdout(buffer):
-                interpreter = AWKInterpreter(awk_script)
+            with timer.phase("parse"):
+                interpreter = AWKInterpreter(awk_script, output=output)
+            if uploaded_file is not None:
+                interpreter.set_input(
+                    read_upload(uploaded_file, interpreter, progress))
+            else:
                 interpreter.set_input(input_data)
+            with timer.phase("execute"):
                 interpreter.run()
         except Exception:
             logger.error("Error running AWK interpreter", exc_info=True)
+            timer.finish(output_bytes=output.size, error=True)
             st.error(
                 "An error occurred while executing the AWK script. Please check your script and input data."
             )
+            output.file.close()
             return
 
-        output = buffer.getvalue()
-        if output:
-            st.subheader("Output")
-            st.code(output, language='text')
+        if progress is not None:
+            progress.progress(1.0,
+                              text=f"Read {uploaded_file.size:,} bytes, "
+                              f"NR = {interpreter.builtins['NR']:,}")
+        # Kept in the session so paging and searching survive reruns
+        previous = st.session_state.get("pawky_output")
+        if previous is not None:
+            previous.close()
+        st.session_state["pawky_output"] = output.to_store(
+            interpreter.builtins['ORS'], interpreter.builtins['OFS'])
+    else:
+        timer = None
+
+    store = st.session_state.get("pawky_output")
+    if store is not None:
+        if timer is None:
+            render_output(store)
+        else:
+            with timer.phase("render"):
+                render_output(store)
+    if timer is not None:
+        event = timer.finish(records=interpreter.builtins['NR'],
+                             output_bytes=output.size)
+        show_timings(event)
+
+
+def split_table(lines: list[str], delimiter: str) -> Optional[list[list[str]]]:
+    # Only a page where every line has the same number of fields is a table
+    if not delimiter:
+        return None
+    rows = [line.split(delimiter) for line in lines]
+    width = len(rows[0])
+    if width < 2 or any(len(row) != width for row in rows):
+        return None
+    return rows
+
+
+def render_output(store: OutputStore) -> None:
+    st.subheader("Output")
+    if not store.line_count:
+        st.info("No output generated.")
+        return
+    st.caption(f"{store.line_count:,} lines, {store.size:,} bytes")
+
+    query = st.text_input("Search output:")
+    if query:
+        matches = store.search(query, MAX_SEARCH_RESULTS)
+        if len(matches) == MAX_SEARCH_RESULTS:
+            st.caption(
+                f"Showing the first {MAX_SEARCH_RESULTS:,} matching lines")
         else:
-            st.info("No output generated.")
+            st.caption(f"{len(matches):,} matching lines")
+        if matches:
+            st.dataframe(
+                {
+                    "Line": [line + 1 for line in matches],
+                    "Text":
+                    [store.lines(line, line + 1)[0] for line in matches],
+                },
+                hide_index=True)
+
+    page_count = math.ceil(store.line_count / OUTPUT_PAGE_SIZE)
+    page = st.number_input(f"Page (of {page_count:,}):",
+                           min_value=1,
+                           max_value=page_count,
+                           value=1)
+    start = (page - 1) * OUTPUT_PAGE_SIZE
+    lines = store.lines(start, start + OUTPUT_PAGE_SIZE)
+    rows = split_table(lines, store.delimiter)
+    if rows is not None and st.toggle("Show as table", value=True):
+        columns = zip(*rows)
+        st.dataframe(
+            {
+                f"${i}": column
+                for i, column in enumerate(columns, start=1)
+            },
+            hide_index=True)
+    else:
+        st.code('\n'.join(lines), language='text')
+
+    # The whole output is only read back when asked for, not on every rerun
+    if st.button("Prepare download"):
+        st.download_button("Download output",
+                           data=store.getvalue(),
+                           file_name="output.txt",
+                           mime="text/plain")
 
 
 def run_pregexy():
+    import pregexy
+
     st.title(PROJECT_2["title"])
     st.markdown(PROJECT_2["description"], unsafe_allow_html=True)
     st.markdown(f"[Code]({PROJECT_2['repository']})")
@@ -158,20 +420,55 @@ def run_pregexy():
             )
             return
 
-        output = pregexy.is_match(text, pattern)
-        st.subheader("Output")
-        st.code(output, language='text')
+        timer = metrics.RequestTimer(metrics.registry, "pregexy")
+        hits = pregexy.compile.cache_info().hits
+        try:
+            with timer.phase("parse"):
+                compiled = pregexy.compile(pattern)
+        except ValueError as e:
+            timer.finish(error=True)
+            st.error(f"Invalid pattern: {e}")
+            return
+        # Only a guess: the cache is shared with every other session, and a
+        # hit of one on another thread during the compile counts here too
+        likely_cache_hit = pregexy.compile.cache_info().hits > hits
+        with timer.phase("execute"):
+            output = compiled.fullmatch(text)
+        with timer.phase("render"):
+            st.subheader("Output")
+            st.code(output, language='text')
+        event = timer.finish(records=1,
+                             output_bytes=len(str(output)),
+                             likely_cache_hit=likely_cache_hit)
+        show_timings(event)
+
+
+def show_timings(event: dict) -> None:
+    if st.session_state.get("show_timings"):
+        st.caption(metrics.footer(event))
+
+
+def run_metrics():
+    st.title(METRICS_PAGE)
+    st.markdown(
+        "Latency percentiles of the demo runs served by this "
+        f"process. Every run is also logged to `{metrics.METRICS_LOG}`.")
+    st.button("Refresh")
+    st.code(metrics.registry.report(), language='text')
 
 
 def main():
     st.sidebar.title("lentil32 Dashboard")
-    app_mode = st.sidebar.radio("Demos",
-                                [PROJECT_1["title"], PROJECT_2["title"]])
+    app_mode = st.sidebar.radio(
+        "Demos", [PROJECT_1["title"], PROJECT_2["title"], METRICS_PAGE])
+    st.sidebar.toggle("Show timings", key="show_timings")
 
     if app_mode == PROJECT_1["title"]:
         run_pawky()
     elif app_mode == PROJECT_2["title"]:
         run_pregexy()
+    elif app_mode == METRICS_PAGE:
+        run_metrics()
     else:
         st.error("Unknown option selected.")
 